@@ -0,0 +1,155 @@
+import os
+import sys
+from time import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def resident_memory():
+    """
+    Resident memory of this process in bytes, or None if it cannot be read.
+    Uses /proc where available and falls back to the peak from getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    return peak_resident_memory()
+
+
+def peak_resident_memory():
+    """
+    Highest resident memory of this process so far in bytes (getrusage), or
+    None if it cannot be read.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB everywhere else
+
+
+class SearchBudget:
+    """
+    Limits a solver may use: wall time in seconds, expanded nodes and resident
+    memory in bytes (None means unlimited). Time and memory are only checked
+    every ``check_every`` expansions, so a search may overshoot them slightly.
+
+    ``cancel`` is an optional event (threading or multiprocessing); once it is
+    set the search stops at the next check, as if out of budget.
+
+    With ``progress`` the meter also keeps the lowest heuristic value expanded
+    (``best_h``) for a progress display, at the cost of one heuristic call per
+    expansion.
+
+    ``spill_after`` moves a search's closed set to a memory-mapped file in
+    ``spill_dir`` (the system temp directory by default) once it holds that
+    many states, so exhaustive searches are not bounded by RAM.
+    """
+
+    def __init__(self, time_limit=60, max_nodes=None, max_memory=None, check_every=256, cancel=None,
+                 progress=False, spill_after=None, spill_dir=None):
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.check_every = check_every
+        self.cancel = cancel
+        self.progress = progress
+        self.spill_after = spill_after
+        self.spill_dir = spill_dir
+
+    def start(self, start_time=None):
+        return BudgetMeter(self, start_time)
+
+
+class BudgetExceeded:
+    """
+    Returned by a search that ran out of budget instead of finishing.
+
+    ``reason`` is "cancelled", "time", "nodes", "memory" or "worker" (an HDA*
+    worker process died; no partial state then). ``state`` is the most advanced
+    state expanded (most cards on the foundations) and ``moves`` leads to it
+    from the initial state.
+    """
+
+    def __init__(self, reason, nodes, elapsed, state, moves):
+        self.reason = reason
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.state = state
+        self.moves = moves
+
+    def __repr__(self):
+        return (f"BudgetExceeded(reason={self.reason!r}, nodes={self.nodes}, elapsed={self.elapsed:.2f}, "
+                f"moves={len(self.moves) if self.moves is not None else None})")
+
+
+class BudgetMeter:
+    """
+    Usage of one ``SearchBudget`` by one run of a solver.
+
+    The counters are plain attributes, so another thread may read them while
+    the search runs: ``nodes`` expanded, ``frontier`` size (open states, or
+    path depth for the depth-first searches) and ``best_h`` when tracked.
+    """
+
+    def __init__(self, budget, start_time=None):
+        self.budget = budget
+        self.start_time = time() if start_time is None else start_time
+        self.nodes = 0
+        self.exceeded = None  # reason once a limit was hit
+        self.best_home = -1
+        self.best_state = None
+        self.best_moves = None
+        self.frontier = 0
+        self.heuristic = None  # set by the solver when the budget tracks progress
+        self.best_h = None
+
+    def elapsed(self):
+        return time() - self.start_time
+
+    def charge(self, frontier=0):
+        """
+        Counts one expansion. Returns the reason if the budget is used up.
+        """
+        self.nodes += 1
+        self.frontier = frontier
+        if self.nodes % self.budget.check_every == 0 or self.nodes == self.budget.max_nodes:
+            self.check()
+        return self.exceeded
+
+    def check(self):
+        budget = self.budget
+        if budget.cancel is not None and budget.cancel.is_set():
+            self.exceeded = "cancelled"
+        elif budget.time_limit is not None and time() - self.start_time > budget.time_limit:
+            self.exceeded = "time"
+        elif budget.max_nodes is not None and self.nodes >= budget.max_nodes:
+            self.exceeded = "nodes"
+        elif budget.max_memory is not None:
+            memory = resident_memory()
+            if memory is not None and memory > budget.max_memory:
+                self.exceeded = "memory"
+        return self.exceeded
+
+    def offer(self, state, moves_func):
+        """
+        Remembers ``state`` as the best partial state if it has more cards
+        home than any before. ``moves_func()`` is only called when it does.
+        """
+        if self.heuristic is not None:
+            h = self.heuristic(state)
+            if self.best_h is None or h < self.best_h:
+                self.best_h = h
+        home = sum(state.foundation_counts())
+        if home > self.best_home:
+            self.best_home = home
+            self.best_state = state.snapshot()
+            self.best_moves = list(moves_func())
+
+    def result(self):
+        return BudgetExceeded(self.exceeded, self.nodes, time() - self.start_time, self.best_state,
+                              self.best_moves)
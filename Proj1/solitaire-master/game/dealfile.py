@@ -0,0 +1,211 @@
+"""
+Binary deal files.
+
+A state is stored as one fixed-size record of RECORD_SIZE bytes:
+
+    8 bytes    length of each tableau column
+    4 bytes    free cells (card code, or EMPTY)
+    4 bytes    foundation tops (card code, or EMPTY)
+    52 bytes   the tableau cards, column after column (bottom card first),
+               padded with EMPTY
+
+Card codes are the ones ``CompressedDeck`` uses, so a record is read back by
+slicing: no per-card parsing. An archive (``.deals``) is a 16-byte header
+followed by packed records; ``DealArchive`` memory-maps it and decodes
+records on demand. A single state is just an archive of one.
+
+Conversion from and to the text format of ``states/deck*.txt``:
+
+    python dealfile.py pack states/ --output states.deals
+    python dealfile.py unpack states.deals --output unpacked/
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from deck import Deck, CompressedDeck, PileLayout, EMPTY, card_name
+
+MAGIC = b"FCDEAL"
+VERSION = 1
+HEADER = struct.Struct("<6sHHHI")  # magic, version, record size, reserved, record count
+ARCHIVE_EXTENSION = ".deals"
+
+TABLEAU_COLUMNS, FREE_CELLS, FOUNDATIONS = 8, 4, 4
+CARDS_OFFSET = TABLEAU_COLUMNS + FREE_CELLS + FOUNDATIONS
+RECORD_SIZE = CARDS_OFFSET + 52
+
+_layouts = {}  # card size -> PileLayout of Deck.empty_piles
+_open_archives = {}  # path -> DealArchive, for load_state
+
+
+def standard_layout(card_size=(100, 150)):
+    """
+    The PileLayout every decoded state shares (the layout state files load into).
+    """
+    card_size = tuple(card_size)
+    layout = _layouts.get(card_size)
+    if layout is None:
+        layout = _layouts[card_size] = PileLayout(Deck.empty_piles(card_size), card_size)
+    return layout
+
+
+def encode_state(state):
+    """
+    Packs a CompressedDeck with the standard 8/4/4 piles into one record.
+    """
+    if (len(state.tableau), len(state.free_cells), len(state.foundations)) != (TABLEAU_COLUMNS, FREE_CELLS,
+                                                                                 FOUNDATIONS):
+        raise ValueError("only states with 8 tableau columns, 4 free cells and 4 foundations can be packed")
+    cards = b"".join(state.tableau)
+    return (bytes(len(column) for column in state.tableau) + bytes(state.free_cells) + bytes(state.foundations)
+            + cards + bytes((EMPTY,)) * (52 - len(cards)))
+
+
+def decode_state(record, layout=None):
+    """
+    Unpacks one record into a CompressedDeck on ``layout`` (the standard
+    layout by default).
+    """
+    tableau = []
+    offset = CARDS_OFFSET
+    for length in record[:TABLEAU_COLUMNS]:
+        tableau.append(bytes(record[offset:offset + length]))
+        offset += length
+    return CompressedDeck.from_parts(layout or standard_layout(), tableau,
+                                     bytearray(record[TABLEAU_COLUMNS:TABLEAU_COLUMNS + FREE_CELLS]),
+                                     bytearray(record[TABLEAU_COLUMNS + FREE_CELLS:CARDS_OFFSET]))
+
+
+def write_archive(path, states):
+    """
+    Writes the states (any iterable, consumed once) as an archive and
+    returns how many were written.
+    """
+    count = 0
+    with open(path, "wb") as archive:
+        archive.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, 0, 0))
+        for state in states:
+            archive.write(encode_state(state))
+            count += 1
+        archive.seek(0)
+        archive.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, 0, count))
+    return count
+
+
+class DealArchive:
+    """
+    Read-only view of a ``.deals`` archive. The file is memory-mapped, so
+    opening it costs nothing per deal and records are only decoded when
+    indexed or iterated.
+    """
+
+    def __init__(self, path, card_size=(100, 150)):
+        self.path = path
+        self.layout = standard_layout(card_size)
+        with open(path, "rb") as archive:
+            header = archive.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a deal archive")
+            magic, version, record_size, _, self.count = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+                raise ValueError(f"{path} is not a version {VERSION} deal archive")
+            if os.fstat(archive.fileno()).st_size < HEADER.size + self.count * RECORD_SIZE:
+                raise ValueError(f"{path} is truncated")
+            self._map = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError(f"deal {index} out of range")
+        offset = HEADER.size + (index % self.count) * RECORD_SIZE
+        return self._map[offset:offset + RECORD_SIZE]
+
+    def __getitem__(self, index):
+        return decode_state(self.record(index), self.layout)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_archive(path):
+    return path.endswith(ARCHIVE_EXTENSION)
+
+
+def archive_entries(path):
+    """
+    Names of the deals in an archive, ``path#index``, as accepted by
+    ``load_state``.
+    """
+    with DealArchive(path) as archive:
+        return [f"{path}#{index}" for index in range(len(archive))]
+
+
+def load_state(name, card_size=(100, 150)):
+    """
+    Loads a CompressedDeck from a text state file or from ``archive#index``.
+    Archives stay open (mapped) for later calls.
+    """
+    path, _, index = name.rpartition("#")
+    if path and is_archive(path):
+        archive = _open_archives.get(path)
+        if archive is None:
+            archive = _open_archives[path] = DealArchive(path, card_size)
+        return archive[int(index)]
+    return CompressedDeck.load_from_file(name, card_size)
+
+
+def write_text_state(state, path):
+    """
+    Writes a state in the text format of ``Deck.load_deck_from_file``.
+    """
+    with open(path, "w") as file:
+        for index, pile_type in enumerate(state.layout.pile_types):
+            cards = ";".join(card_name(code) for code in state.pile_cards(index))
+            file.write(f"{pile_type};{cards}\n")
+
+
+def main(argv=None):
+    from solve import find_deals
+
+    parser = argparse.ArgumentParser(description="Convert FreeCell state files to and from deal archives.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="pack state files (and archives) into one archive")
+    pack.add_argument("paths", nargs="+", help="state files, archives, directories or glob patterns")
+    pack.add_argument("--output", required=True, help="archive to write")
+    unpack = commands.add_parser("unpack", help="write every deal of an archive as a text state file")
+    unpack.add_argument("archive")
+    unpack.add_argument("--output", required=True, help="directory for the deck<N>.txt files")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        names = find_deals(args.paths)
+        if not names:
+            parser.error("no state files found")
+        count = write_archive(args.output, (load_state(name) for name in names))
+        print(f"Packed {count} deals into {args.output}", file=sys.stderr)
+    else:
+        os.makedirs(args.output, exist_ok=True)
+        with DealArchive(args.archive) as archive:
+            for index, state in enumerate(archive):
+                write_text_state(state, os.path.join(args.output, f"deck{index}.txt"))
+        print(f"Unpacked {len(archive)} deals into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 import os
 import random
 from copy import deepcopy
-import pygame  # type: ignore
 from card import Card
 from pile import Pile
 
@@ -21,21 +20,19 @@ class Deck:
         self.ranks = ['ace', '2', '3', '4', '5', '6', '7', '8',
                       '9', '10', 'jack', 'queen', 'king']
 
-        self.card_images = {}
         self.selection = False
         self.selected_cards = []
         self.selected_pile = None
         self.selection_rect = None
         self.selection_color = (255, 255, 0)
+        # (source, target, num_cards) of the last move made by clicking, in pile indices
+        self.last_move = None
         self.empty_color = (25, 150, 25)  # Darker green for foundation piles
         self.empty_color2 = (100, 200, 100)  # Keeping the lighter green for free-cell piles
 
         self.piles = piles
         self.card_size = card_size
 
-        self.load_card_images()
-        self.resize_card_images()
-
     def __str__(self):
         result = []
         for i, pile in enumerate(self.piles):
@@ -43,14 +40,12 @@ class Deck:
             result.append(f"Pile {i}: {pile_cards}")
         return "\n".join(result)
 
-    def load_card_images(self):
-        for suit in self.suits:
-            for rank in self.ranks:
-                image_path = os.path.join('resources', 'cards', f'{rank}_of_{suit}.png')
-                try:
-                    self.card_images[image_path] = pygame.image.load(image_path)
-                except FileNotFoundError:
-                    print(f"Warning: Card image not found: {image_path}")
+    @property
+    def card_images(self):
+        # Images belong to the renderer, which is only imported once something
+        # is drawn: building and copying decks never touches pygame or the disk
+        import renderer
+        return renderer.card_images(self.card_size)
 
     def clone(self):
         new_piles = deepcopy(self.piles)
@@ -64,10 +59,6 @@ class Deck:
         )
         return new_deck
 
-    def resize_card_images(self):
-        for name_of_image, card_image in self.card_images.items():
-            self.card_images[name_of_image] = pygame.transform.scale(card_image, self.card_size)
-
     def load_piles(self, display_size):
         pile_spacing = 25
 
@@ -135,9 +126,16 @@ class Deck:
 
     @classmethod
     def load_deck_from_file(cls, file_path, card_size=(100, 150), display_size=(1100, 800)):
+        piles = cls.load_piles_from_file(file_path, card_size, display_size)
+        return cls(piles=piles, card_size=card_size)
+
+    @staticmethod
+    def empty_piles(card_size=(100, 150), display_size=(1100, 800)):
+        """
+        The standard layout with no cards: 8 tableau piles, then 4 free cells
+        and 4 foundations.
+        """
         piles = []
-        suits = ['clubs', 'diamonds', 'hearts', 'spades']
-        ranks = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
 
         display_width, display_height = display_size
         pile_spacing = 25
@@ -148,7 +146,6 @@ class Deck:
         foundation_x_step = card_size[0] + pile_spacing
         foundation_start_x = 50
 
-        # Create empty piles
         for i in range(8):  # 8 tableau piles
             piles.append(Pile([], start_x + i * (card_size[0] + pile_spacing), start_y, card_size, pile_type="tableau"))
 
@@ -160,6 +157,17 @@ class Deck:
             piles.append(Pile([], foundation_start_x + (i + 4) * foundation_x_step, pile_spacing, card_size,
                               pile_type="foundation"))
 
+        return piles
+
+    @staticmethod
+    def load_piles_from_file(file_path, card_size=(100, 150), display_size=(1100, 800)):
+        """
+        Reads a state file into laid-out piles, without loading any images.
+        """
+        piles = Deck.empty_piles(card_size, display_size)
+        suits = ['clubs', 'diamonds', 'hearts', 'spades']
+        ranks = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
+
         # Read the file and fill the piles
         with open(file_path, 'r') as file:
             for line in file:
@@ -197,8 +205,7 @@ class Deck:
                             pile.cards = pile_cards
                             break
 
-        # Return the deck with the initialized piles
-        return cls(piles=piles, card_size=card_size)
+        return piles
 
     def deselect(self):
         self.selection = False
@@ -224,6 +231,7 @@ class Deck:
     def handle_click(self, mouse_position):
         piles_to_update = None
         valid_move = False
+        self.last_move = None
 
         if not self.selection:
             # the player selects card/s
@@ -249,6 +257,9 @@ class Deck:
             pile_to_transfer_to = self.which_pile_clicked(mouse_position)
             if self.selected_pile is not None and pile_to_transfer_to is not None:
                 valid_move = self.selected_pile.transfer_cards(self.selected_cards, pile_to_transfer_to, self.ranks)
+                if valid_move:
+                    self.last_move = (self.piles.index(self.selected_pile), self.piles.index(pile_to_transfer_to),
+                                      len(self.selected_cards))
             else:
                 piles_to_update = None
 
@@ -268,20 +279,8 @@ class Deck:
             return True
 
     def display(self, game_display):
-        for pile in self.piles:
-            if pile.pile_type == 'foundation' and len(pile.cards) == 0:
-                pygame.draw.rect(game_display, self.empty_color,
-                                 [pile.x, pile.y + 40, pile.card_width, pile.card_height])
-            if pile.pile_type == 'free-cell' and len(pile.cards) == 0:
-                pygame.draw.rect(game_display, self.empty_color2,
-                                 [pile.x, pile.y + 40, pile.card_width, pile.card_height])
-            for card in pile.cards:
-                if self.selection and self.selection_rect != None and card == self.selected_cards[0]:
-                    pygame.draw.rect(game_display, self.selection_color, self.selection_rect)
-
-                img = self.card_images[card.name_of_image]
-
-                game_display.blit(img, [card.x, card.y + 40])
+        import renderer
+        renderer.draw_deck(game_display, self)
 
     def make_move(self, move):
         source_pile, target_pile, selected_cards = move
@@ -293,6 +292,18 @@ class Deck:
 
         self.piles[source_index].transfer_cards(selected_cards, self.piles[target_index], self.ranks)
 
+    def apply_move(self, move):
+        """
+        Moves the top ``num_cards`` cards of pile ``source`` onto pile
+        ``target`` without checking the rules, the same move as
+        ``CompressedDeck.apply_move``. Used to replay and take back moves.
+        """
+        source, target, num_cards = move
+        source_cards = self.piles[source].cards
+        self.piles[target].cards.extend(source_cards[-num_cards:])
+        del source_cards[-num_cards:]
+        return self
+
     def is_valid_sequence(self, cards):
         if not cards or len(cards) == 1:
             return True  # A single card is always valid
@@ -340,39 +351,333 @@ class Deck:
                 self.cards.append(card)
 
 
-class CompressedDeck:
-    def __init__(self, piles, card_size, ranks):
-        self.piles = piles
+# Compact card encoding used by the solvers: a card is an int in 0..51,
+# suit_index * 13 + rank_index, so tableau columns fit in a ``bytes`` object.
+SUITS = ['clubs', 'diamonds', 'hearts', 'spades']
+RANKS = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
+
+CARD_CODES = {(rank, suit): s * 13 + r for s, suit in enumerate(SUITS) for r, rank in enumerate(RANKS)}
+CARD_RANK = tuple(code % 13 for code in range(52))
+CARD_SUIT = tuple(code // 13 for code in range(52))
+CARD_RED = tuple(code // 13 in (1, 2) for code in range(52))
+
+EMPTY = 255  # marks an empty free cell / foundation slot
+
+TABLEAU, FREE_CELL, FOUNDATION = 0, 1, 2
+PILE_KINDS = {'tableau': TABLEAU, 'free-cell': FREE_CELL, 'foundation': FOUNDATION}
+
+# Zobrist keys are built from (card, what the card rests on): another card,
+# the bottom of a column, a free cell or its foundation. That set of pairs
+# describes a position up to the order of the columns, the order of the
+# free cells and which foundation pile holds which suit, and moving a run
+# only changes what its bottom card rests on.
+ON_COLUMN_BASE, ON_FREE_CELL, ON_FOUNDATION = 52, 53, 54
+_ZOBRIST_WIDTH = 55
+_zobrist_random = random.Random(0x5EED)  # fixed seed: keys are stable across runs and processes
+ZOBRIST = tuple(_zobrist_random.getrandbits(64) for _ in range(52 * _ZOBRIST_WIDTH))
+
+
+def encode_card(card):
+    return CARD_CODES[(card.rank, card.suit)]
+
+
+def card_name(code):
+    return f"{RANKS[CARD_RANK[code]]}_of_{SUITS[CARD_SUIT[code]]}"
+
+
+class PileLayout:
+    """
+    Geometry and pile-type information shared by every state of a search.
+
+    Piles keep the indices they have in ``Deck.piles`` so that a move
+    (source, target, num_cards) means the same thing on both representations.
+    """
+
+    def __init__(self, piles, card_size):
         self.card_size = card_size
-        self.ranks = ranks
+        self.pile_types = tuple(pile.pile_type for pile in piles)
+        self.positions = tuple((pile.x, pile.y) for pile in piles)
+
+        self.tableau_piles = []
+        self.free_cell_piles = []
+        self.foundation_piles = []
+        self.slots = []  # pile index -> (kind, index inside that kind's array)
+        for index, pile_type in enumerate(self.pile_types):
+            kind = PILE_KINDS[pile_type]
+            group = (self.tableau_piles, self.free_cell_piles, self.foundation_piles)[kind]
+            self.slots.append((kind, len(group)))
+            group.append(index)
+
+    def __len__(self):
+        return len(self.pile_types)
+
+
+class CompressedDeck:
+    """
+    Compact FreeCell state used by the search algorithms.
+
+    Tableau columns are ``bytes`` of card codes (bottom card first), free
+    cells and foundations are small ``bytearray`` s holding a card code or
+    ``EMPTY`` (a foundation stores only its top card). Everything else lives
+    in the shared ``PileLayout``, so copying a state copies three small
+    containers and shares the column bytes.
+    """
+
+    __slots__ = ('layout', 'tableau', 'free_cells', 'foundations', 'hash_key', 'move_stack')
+
+    def __init__(self, piles, card_size, ranks=RANKS):
+        self.layout = PileLayout(piles, card_size)
+        self.tableau = []
+        self.free_cells = bytearray()
+        self.foundations = bytearray()
+
+        for pile in piles:
+            codes = bytes(encode_card(card) for card in pile.cards)
+            if pile.pile_type == 'tableau':
+                self.tableau.append(codes)
+            elif pile.pile_type == 'free-cell':
+                self.free_cells.append(codes[-1] if codes else EMPTY)
+            else:
+                self.foundations.append(codes[-1] if codes else EMPTY)
+
+        self.hash_key = self.compute_key()
+        self.move_stack = None
+
+    @classmethod
+    def load_from_file(cls, file_path, card_size=(100, 150)):
+        """
+        Reads a state file (``Deck.load_deck_from_file`` format) straight
+        into a compressed state, for headless solving.
+        """
+        return cls(Deck.load_piles_from_file(file_path, card_size), card_size)
+
+    @classmethod
+    def from_parts(cls, layout, tableau, free_cells, foundations, hash_key=None):
+        state = cls.__new__(cls)
+        state.layout = layout
+        state.tableau = tableau
+        state.free_cells = free_cells
+        state.foundations = foundations
+        state.hash_key = state.compute_key() if hash_key is None else hash_key
+        state.move_stack = None
+        return state
+
+    def __hash__(self):
+        return self.hash_key
+
+    def __eq__(self, other):
+        return isinstance(other, CompressedDeck) and self.hash_key == other.hash_key
+
+    @property
+    def card_size(self):
+        return self.layout.card_size
+
+    def __str__(self):
+        result = []
+        for i in range(len(self.layout)):
+            result.append(f"Pile {i}: {[card_name(code) for code in self.pile_cards(i)]}")
+        return "\n".join(result)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def pile_cards(self, index):
+        """
+        Returns the card codes of a pile, bottom card first.
+        """
+        kind, slot = self.layout.slots[index]
+        if kind == TABLEAU:
+            return self.tableau[slot]
+        if kind == FREE_CELL:
+            code = self.free_cells[slot]
+            return b'' if code == EMPTY else bytes((code,))
+        top = self.foundations[slot]
+        if top == EMPTY:
+            return b''
+        return bytes(range(top - CARD_RANK[top], top + 1))
+
+    def pile_size(self, index):
+        kind, slot = self.layout.slots[index]
+        if kind == TABLEAU:
+            return len(self.tableau[slot])
+        if kind == FREE_CELL:
+            return 0 if self.free_cells[slot] == EMPTY else 1
+        top = self.foundations[slot]
+        return 0 if top == EMPTY else CARD_RANK[top] + 1
+
+    def foundation_counts(self):
+        """
+        Number of cards on the foundations for each suit, indexed like SUITS.
+        """
+        counts = [0, 0, 0, 0]
+        for top in self.foundations:
+            if top != EMPTY:
+                counts[CARD_SUIT[top]] = CARD_RANK[top] + 1
+        return counts
 
     def decompress(self):
-        return Deck(piles=self.piles, card_size=self.card_size)
+        layout = self.layout
+        piles = []
+        for index, pile_type in enumerate(layout.pile_types):
+            x, y = layout.positions[index]
+            cards = []
+            for code in self.pile_cards(index):
+                rank, suit = RANKS[CARD_RANK[code]], SUITS[CARD_SUIT[code]]
+                name_of_image = os.path.join('resources', 'cards', f'{rank}_of_{suit}.png')
+                cards.append(Card(name_of_image, layout.card_size, rank, suit))
+            piles.append(Pile(cards, x, y, layout.card_size, pile_type=pile_type))
+        return Deck(piles=piles, card_size=layout.card_size)
 
-    def can_move_to_foundation(self, card):
-        for pile in self.piles:
-            if pile.pile_type == "foundation":
-                if not pile.cards and card.rank == "ace":
-                    return True
-                elif pile.cards:
-                    top_card = pile.cards[-1]
-                    if top_card.suit == card.suit and self.ranks.index(card.rank) == self.ranks.index(
-                            top_card.rank) + 1:
-                        return True
-        return False
+    def can_move_to_foundation(self, code):
+        return CARD_RANK[code] == self.foundation_counts()[CARD_SUIT[code]]
 
     def check_for_win(self):
-        foundation_piles = [pile for pile in self.piles if pile.pile_type == "foundation"]
-        for pile in foundation_piles:
-            if len(pile.cards) < 13:
-                return False
-        return True
+        # every card has left the tableau and the free cells
+        return not any(self.tableau) and all(code == EMPTY for code in self.free_cells)
+
+    def compute_key(self):
+        """
+        Computes the canonical Zobrist key from scratch.
+        """
+        key = 0
+        for column in self.tableau:
+            below = ON_COLUMN_BASE
+            for code in column:
+                key ^= ZOBRIST[code * _ZOBRIST_WIDTH + below]
+                below = code
+        for code in self.free_cells:
+            if code != EMPTY:
+                key ^= ZOBRIST[code * _ZOBRIST_WIDTH + ON_FREE_CELL]
+        for top in self.foundations:
+            if top != EMPTY:
+                for code in range(top - CARD_RANK[top], top + 1):
+                    key ^= ZOBRIST[code * _ZOBRIST_WIDTH + ON_FOUNDATION]
+        return key
+
+    def key(self):
+        """
+        Canonical 64-bit key: equal for states that differ only in column,
+        free-cell or foundation-pile order. Maintained incrementally by
+        ``apply_move``.
+        """
+        return self.hash_key
 
     def clone(self):
-        new_piles = deepcopy(self.piles)
-        return CompressedDeck(new_piles, self.card_size, self.ranks)
+        return CompressedDeck.from_parts(self.layout, list(self.tableau), bytearray(self.free_cells),
+                                         bytearray(self.foundations), self.hash_key)
+
+    def snapshot(self):
+        """
+        Independent copy of the current position, without the move stack.
+        """
+        return self.clone()
 
     def is_sequential(self, card1, card2):
-        rank1 = self.ranks.index(card1.rank)
-        rank2 = self.ranks.index(card2.rank)
-        return rank1 == rank2 + 1 and card1.suit == card2.suit
+        return CARD_RANK[card1] == CARD_RANK[card2] + 1 and CARD_SUIT[card1] == CARD_SUIT[card2]
+
+    def is_valid_run(self, cards):
+        """
+        True if the cards (bottom first) are built down in alternating colours.
+        """
+        for i in range(len(cards) - 1):
+            card1, card2 = cards[i], cards[i + 1]
+            if CARD_RANK[card1] != CARD_RANK[card2] + 1 or CARD_RED[card1] == CARD_RED[card2]:
+                return False
+        return True
+
+    def valid_transfer(self, source, target, num_cards):
+        """
+        Same rules as ``Pile.valid_transfer`` for moving the top ``num_cards``
+        cards of pile ``source`` onto pile ``target``.
+        """
+        cards = self.pile_cards(source)
+        if num_cards > len(cards) or not self.is_valid_run(cards[-num_cards:]):
+            return False
+        top_card = cards[-num_cards]
+
+        kind, slot = self.layout.slots[target]
+        if kind == FREE_CELL:
+            return num_cards == 1 and self.free_cells[slot] == EMPTY
+
+        if kind == FOUNDATION:
+            if num_cards > 1:
+                return False
+            bottom_card = self.foundations[slot]
+            if bottom_card == EMPTY:
+                return CARD_RANK[top_card] == 0
+            return top_card == bottom_card + 1 and CARD_RANK[top_card] != 0
+
+        column = self.tableau[slot]
+        if not column:
+            return True
+        bottom_card = column[-1]
+        return CARD_RANK[bottom_card] == CARD_RANK[top_card] + 1 and CARD_RED[bottom_card] != CARD_RED[top_card]
+
+    def apply_move(self, move):
+        """
+        Moves the top ``num_cards`` cards from ``source`` to ``target`` in place.
+        The move is assumed to be valid.
+        """
+        source, target, num_cards = move
+        slots = self.layout.slots
+
+        kind, slot = slots[source]
+        if kind == TABLEAU:
+            column = self.tableau[slot]
+            cards = column[-num_cards:]
+            self.tableau[slot] = column[:-num_cards]
+            below = column[-num_cards - 1] if len(column) > num_cards else ON_COLUMN_BASE
+        elif kind == FREE_CELL:
+            cards = bytes((self.free_cells[slot],))
+            self.free_cells[slot] = EMPTY
+            below = ON_FREE_CELL
+        else:
+            top = self.foundations[slot]
+            cards = bytes((top,))
+            self.foundations[slot] = EMPTY if CARD_RANK[top] == 0 else top - 1
+            below = ON_FOUNDATION
+        moved = cards[0] * _ZOBRIST_WIDTH
+        self.hash_key ^= ZOBRIST[moved + below]
+
+        kind, slot = slots[target]
+        if kind == TABLEAU:
+            column = self.tableau[slot]
+            below = column[-1] if column else ON_COLUMN_BASE
+            self.tableau[slot] = column + cards
+        elif kind == FREE_CELL:
+            self.free_cells[slot] = cards[0]
+            below = ON_FREE_CELL
+        else:
+            self.foundations[slot] = cards[0]
+            below = ON_FOUNDATION
+        self.hash_key ^= ZOBRIST[moved + below]
+
+        return self
+
+    def undo_move(self, move):
+        """
+        Reverts ``apply_move(move)``; the move must be the last one applied.
+        """
+        source, target, num_cards = move
+        return self.apply_move((target, source, num_cards))
+
+    def push_move(self, move):
+        """
+        Applies a move and remembers it so ``pop_move`` can take it back.
+        Lets a search walk the tree on one mutable state instead of cloning.
+        """
+        if self.move_stack is None:
+            self.move_stack = []
+        self.move_stack.append(move)
+        return self.apply_move(move)
+
+    def pop_move(self):
+        """
+        Takes back the most recent ``push_move`` and returns that move.
+        """
+        move = self.move_stack.pop()
+        self.undo_move(move)
+        return move
+
+    def pushed_moves(self):
+        return list(self.move_stack or ())
@@ -0,0 +1,193 @@
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from dealfile import RECORD_SIZE, decode_state, encode_state
+from searchAlgorithms import BFS
+
+ENTRY = struct.Struct(f"<QQ{RECORD_SIZE}s")  # state key, parent key, packed state (see dealfile)
+KEY = struct.Struct("<Q")
+READ_ENTRIES = 4096  # entries per read from a layer or run file
+
+
+def _read_entries(path):
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(ENTRY.size * READ_ENTRIES)
+            if not chunk:
+                return
+            yield from ENTRY.iter_unpack(chunk)
+
+
+def _read_keys(path):
+    with open(path, "rb") as file:
+        while True:
+            keys = array("Q")
+            keys.frombytes(file.read(KEY.size * READ_ENTRIES))
+            if not keys:
+                return
+            yield from keys
+
+
+def _unseen(entries, key_files):
+    """
+    Drops entries (sorted by key) whose key repeats or appears in one of the
+    sorted ``key_files``, by merging against all of them in one pass.
+    """
+    cursors = [_read_keys(path) for path in key_files]
+    heads = [next(cursor, None) for cursor in cursors]
+    last = None
+    for entry in entries:
+        key = entry[0]
+        if key == last:
+            continue
+        last = key
+        seen = False
+        for index, cursor in enumerate(cursors):
+            head = heads[index]
+            while head is not None and head < key:
+                head = next(cursor, None)
+            heads[index] = head
+            seen = seen or head == key
+        if not seen:
+            yield entry
+
+
+class ExternalBFS(BFS):
+    """
+    Breadth-first search with its layers on disk (delayed duplicate detection).
+
+    Each depth layer is a file of fixed-width entries (state key, parent key,
+    packed state), sorted by key, plus a file of just its keys. A layer is
+    expanded by streaming it; children are collected into runs of
+    ``run_size`` entries that are sorted and written out. The runs are then
+    merged, and the merge drops keys seen earlier in the new layer or in any
+    previous layer's key file, so nothing but one run has to be in memory.
+
+    The path to a state is found by looking its parent key up in the layer
+    above (binary search in the sorted file), up to the root, and then
+    replaying moves from the root that lead to those keys one after another.
+    Files go to ``directory`` (the budget's ``spill_dir`` or the system temp
+    directory) and are removed when the search ends.
+    """
+
+    def __init__(self, autoplay=True, budget=None, run_size=100000, directory=None):
+        super().__init__(autoplay, budget)
+        self.run_size = run_size
+        self.directory = directory
+        self.layer_sizes = []  # states per depth of the last search
+
+    def bfs_search(self, initial_state, goal_state_func, operators_func):
+        meter = self.start_meter()
+        state = initial_state.snapshot()
+        settled = self.settle(state, state.apply_move)
+        if goal_state_func(state):
+            return settled
+
+        with tempfile.TemporaryDirectory(dir=self.directory or self.budget.spill_dir) as directory:
+            layers = []  # (states file, keys file) per depth
+            self.layer_sizes = [self._write_layer(directory, layers, [(state.key(), state.key(),
+                                                                       encode_state(state))])]
+            layout = initial_state.layout
+
+            def path_moves(depth, key, *more_keys):
+                return self._path_moves(initial_state, operators_func, layers, depth, key, more_keys)
+
+            depth = 0
+            while True:
+                runs = []
+                buffer = []
+                for key, _, record in _read_entries(layers[depth][0]):
+                    current = decode_state(record, layout)
+                    meter.offer(current, lambda: path_moves(depth, key))
+                    if meter.charge(self.layer_sizes[depth]):
+                        return meter.result()
+
+                    for move in operators_func(current):
+                        applied = self.expand(current, move)
+                        if goal_state_func(current):
+                            return path_moves(depth, key, current.key())
+                        buffer.append((current.key(), key, encode_state(current)))
+                        self.retract(current, applied)
+                    if len(buffer) >= self.run_size:
+                        runs.append(self._write_run(directory, len(runs), buffer))
+                        buffer = []
+                if buffer:
+                    runs.append(self._write_run(directory, len(runs), buffer))
+
+                merged = heapq.merge(*(_read_entries(run) for run in runs))
+                size = self._write_layer(directory, layers, _unseen(merged, [keys for _, keys in layers]))
+                for run in runs:
+                    os.remove(run)
+                if size == 0:
+                    return None
+                self.layer_sizes.append(size)
+                depth += 1
+
+    def _write_run(self, directory, number, entries):
+        entries.sort()
+        path = os.path.join(directory, f"run{number}")
+        with open(path, "wb") as file:
+            last = None
+            for entry in entries:
+                if entry[0] != last:
+                    file.write(ENTRY.pack(*entry))
+                    last = entry[0]
+        return path
+
+    def _write_layer(self, directory, layers, entries):
+        """
+        Writes the next layer from entries sorted by key and returns its size.
+        """
+        depth = len(layers)
+        states_path = os.path.join(directory, f"layer{depth}.states")
+        keys_path = os.path.join(directory, f"layer{depth}.keys")
+        size = 0
+        with open(states_path, "wb") as states, open(keys_path, "wb") as keys:
+            for entry in entries:
+                states.write(ENTRY.pack(*entry))
+                keys.write(KEY.pack(entry[0]))
+                size += 1
+        layers.append((states_path, keys_path))
+        return size
+
+    def _parent_key(self, states_path, key):
+        with open(states_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as entries:
+            low, high = 0, len(entries) // ENTRY.size
+            while low < high:
+                middle = (low + high) // 2
+                if KEY.unpack_from(entries, middle * ENTRY.size)[0] < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            found, parent = struct.unpack_from("<QQ", entries, low * ENTRY.size)
+        if found != key:
+            raise LookupError(f"state {key:#x} is missing from {states_path}")
+        return parent
+
+    def _path_moves(self, initial_state, operators_func, layers, depth, key, more_keys=()):
+        """
+        Individual moves from ``initial_state`` to the state with ``key`` in
+        layer ``depth``, then on through ``more_keys``.
+        """
+        chain = [key]
+        for layer in range(depth, 0, -1):
+            chain.append(self._parent_key(layers[layer][0], chain[-1]))
+        chain.reverse()
+        chain.extend(more_keys)
+
+        # Keys ignore column order, so the moves are found again on the concrete states
+        state = initial_state.snapshot()
+        moves = self.settle(state, state.apply_move)
+        for target in chain[1:]:
+            for move in operators_func(state):
+                applied = self.expand(state, move)
+                if state.key() == target:
+                    moves.extend(applied)
+                    break
+                self.retract(state, applied)
+            else:
+                raise LookupError(f"no move leads to state {target:#x}")
+        return moves
@@ -0,0 +1,60 @@
+import heapq
+from itertools import count
+
+_REMOVED = object()  # placeholder for entries superseded by a cheaper path
+
+
+class PriorityFrontier:
+    """
+    Binary-heap frontier for the best-first searches (A*, Greedy).
+
+    Each heap entry is ``[priority, tie, g, key, item]``. ``tie`` comes from a
+    decreasing counter, so among equal priorities the most recently pushed
+    node is expanded first (the order the old sorted-list frontier used).
+    Pushing a key that is already open with a larger g replaces that entry:
+    the old one is marked as removed and skipped when it reaches the top
+    (lazy deletion), which acts as decrease-key.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}  # key -> live heap entry
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def push(self, item, priority, key, g=0):
+        """
+        Adds ``item`` to the frontier.
+
+        Returns False (and leaves the frontier unchanged) if ``key`` is
+        already open with a g-cost no larger than ``g``.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[2] <= g:
+                return False
+            entry[-1] = _REMOVED
+
+        entry = [priority, -next(self.counter), g, key, item]
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+        return True
+
+    def pop(self):
+        """
+        Removes and returns ``(item, priority, g)`` with the lowest priority.
+        """
+        while self.heap:
+            priority, _, g, key, item = heapq.heappop(self.heap)
+            if item is not _REMOVED:
+                del self.entries[key]
+                return item, priority, g
+        raise IndexError("pop from an empty frontier")
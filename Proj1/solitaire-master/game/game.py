@@ -1,8 +1,10 @@
 import pygame
 from deck import Deck
 import history_manager
+import renderer
 from ui import Text, Button, Checkbox
-from searchAlgorithms import ASTAR, BFS, Greedy, DFS
+from searchAlgorithms import ASTAR, BFS, Greedy, DFS, IDASTAR
+from solver_task import SolverTask
 import os
 import math
 import tkinter as tk
@@ -38,6 +40,15 @@ try:
 except:
     background_image = None
 
+# Solver buttons: action -> (name, solver class)
+SOLVERS = {
+    "astar": ("A*", ASTAR),
+    "dfs": ("DFS", DFS),
+    "bfs": ("BFS", BFS),
+    "greedy": ("Greedy", Greedy),
+    "idastar": ("IDA*", IDASTAR),
+}
+
 def quit_game():
     pygame.quit()
     quit()
@@ -91,8 +102,10 @@ def game_loop():
     start_y = 10
     
     buttons = [
-        Button(display_dimensions, "Undo", (start_x, start_y), (button_width, button_height), grey, centered=False,
-               text_size=11, action="undo"),
+        Button(display_dimensions, "Undo", (start_x, start_y), (button_width // 2 - 2, button_height), grey,
+               centered=False, text_size=11, action="undo"),
+        Button(display_dimensions, "Redo", (start_x + button_width // 2 + 2, start_y),
+               (button_width // 2 - 2, button_height), grey, centered=False, text_size=11, action="redo"),
         Button(display_dimensions, "DFS", (start_x + (button_width + 4 * spacing), start_y),
                (button_width - 40, button_height), grey, centered=False, text_size=10, action="dfs"),
         Button(display_dimensions, "A*", (start_x + (button_width + 4 * spacing) * 1.5 + 10, start_y),
@@ -101,8 +114,10 @@ def game_loop():
                (button_width - 30, button_height), grey, centered=False, text_size=10, action="bfs"),
         Button(display_dimensions, "Greedy", (start_x + (button_width + 4 * spacing) * 3.5 - 100, start_y),
                (button_width - 30, button_height), grey, centered=False, text_size=10, action="greedy"),
-        Button(display_dimensions, "Next", (start_x + (button_width + 4 * spacing) * 3.5, start_y),
-               (button_width, button_height), grey, centered=False, text_size=10, action="next"),
+        Button(display_dimensions, "IDA*", (start_x + (button_width + 4 * spacing) * 3.5 - 20, start_y),
+               (button_width - 40, button_height), grey, centered=False, text_size=10, action="idastar"),
+        Button(display_dimensions, "Next", (start_x + (button_width + 4 * spacing) * 3.5 + 50, start_y),
+               (button_width - 20, button_height), grey, centered=False, text_size=10, action="next"),
         Button(display_dimensions, "Load State", (start_x + (button_width + 6 * spacing) * 4, start_y),
                (button_width, button_height), grey, centered=False, text_size=10, action="load_state"),
         Button(display_dimensions, "New Deck", (start_x + (button_width + 6 * spacing) * 5, start_y),
@@ -115,11 +130,21 @@ def game_loop():
                (100, button_height), red, centered=False, text_size=10, action="quit"),
     ]
 
-    a_star_states = []
+    # Shown while a solver runs in the background
+    progress_label = Button(display_dimensions, "", (140, display_dimensions[1] - 40),
+                            (690, button_height), grey, centered=False, text_size=10)
+    cancel_button = Button(display_dimensions, "Cancel", (840, display_dimensions[1] - 40),
+                           (100, button_height), red, centered=False, text_size=10, action="cancel_solve")
+    solver_task = None
+
+    solution_steps = None  # replay of the last solution found, one move per "Next"
     deck = Deck.load_deck_from_file("states/deck11.txt")
     deck.update(None, display_dimensions[1])
 
-    hm = history_manager.HistoryManager(deck.clone())
+    hm = history_manager.HistoryManager(deck)
+
+    dark_green = (41, 71, 38)
+    screen = renderer.DirtyRectRenderer(dark_green)
 
     def open_load_state_dialog():
         root = tk.Tk()
@@ -133,14 +158,29 @@ def game_loop():
     while True:
         if deck.check_for_win():
             result = win_screen()
+            screen.invalidate()
             if result == "play_again":
                 deck = Deck.load_deck_from_file("states/deck8.txt")
                 deck.update(None, display_dimensions[1])
-                hm = history_manager.HistoryManager(deck.clone())
-                a_star_states = []
+                hm = history_manager.HistoryManager(deck)
+                solution_steps = None
                 continue
             elif result == "start_menu":
                 return
+
+        if solver_task is not None and solver_task.done():
+            result = solver_task.result()
+            if solver_task.cancelled:
+                print(f"{solver_task.name} cancelled.")
+            elif result.solved:
+                solution_steps = result.path.replay(deck)
+                print(f"{solver_task.name} solution path loaded.")
+            solver_task = None
+
+        active_buttons = buttons
+        if solver_task is not None:
+            progress_label.text = solver_task.describe()
+            active_buttons = buttons + [progress_label, cancel_button]
             
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -150,80 +190,76 @@ def game_loop():
                     game_loop()
                 elif event.key == pygame.K_w:
                     win_screen()
+                    screen.invalidate()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
                 if event.button == 1:
-                    piles_to_update, valid_move = deck.handle_click(mouse_pos)
-                    if valid_move:
-                        deck.update(piles_to_update, display_dimensions[1])
-                        hm.valid_move_made(deck.clone())
-
-                    for button in buttons:
+                    # The board stays put while a solver works on it
+                    if solver_task is None:
+                        piles_to_update, valid_move = deck.handle_click(mouse_pos)
+                        if valid_move:
+                            deck.update(piles_to_update, display_dimensions[1])
+                            hm.valid_move_made(deck.last_move)
+
+                    for button in active_buttons:
                         if button.check_if_clicked(mouse_pos):
                             if button.action == "undo":
                                 deck = hm.undo(deck)
-                                deck.update(None, display_dimensions[1])
-                            if button.action == "astar":
-                                astar_solver = ASTAR()
-                                score = [None] * 6
-                                astar_solver.run(deck, score)
-                                if score[0]:
-                                    a_star_states = score[0]
-                                    print("A* solution path loaded.")
-                            if button.action == "dfs":
-                                dfs_solver = DFS()
-                                score = [None] * 6
-                                dfs_solver.run(deck, score)
-                                if score[0]:  
-                                    a_star_states = score[0]
-                                    a_star_states = score[0]
-                                    print("DFS solution path loaded.")
-                            if button.action == "bfs":
-                                bfs_solver = BFS()
-                                score = [None] * 6
-                                bfs_solver.run(deck, score)
-                                if score[3]:
-                                    a_star_states = score[0]
-                            if button.action == "greedy":
-                                greedy_solver = Greedy()
-                                score = [None] * 6
-                                greedy_solver.run(deck, score)
-                                if score[0]:
-                                    a_star_states = score[0]
-                            if button.action == "next":
-                                if a_star_states and len(a_star_states) > 0:
-                                    deck = a_star_states.pop(0)
-                                    deck.update(None, display_dimensions[1])
+                                deck.update(deck.piles, display_dimensions[1])
+                            if button.action == "redo":
+                                deck = hm.redo(deck)
+                                deck.update(deck.piles, display_dimensions[1])
+                            if button.action in SOLVERS and solver_task is None:
+                                name, solver_class = SOLVERS[button.action]
+                                solver_task = SolverTask(name, solver_class(), deck).start()
+                            if button.action == "cancel_solve" and solver_task is not None:
+                                solver_task.cancel()
+                            if button.action == "next" and solution_steps is not None:
+                                step = next(solution_steps, None)
+                                if step is None:
+                                    solution_steps = None
+                                else:
+                                    next_deck, move = step
+                                    if next_deck is deck:
+                                        hm.valid_move_made(move)
+                                    else:
+                                        # The board had changed: the replay restarted from the solution's position
+                                        deck = next_deck
+                                        hm = history_manager.HistoryManager(deck)
+                                    deck.update(deck.piles, display_dimensions[1])
                             if button.action == "load_state":
                                 selected_file = open_load_state_dialog()
+                                screen.invalidate()
                                 if selected_file:
+                                    if solver_task is not None:
+                                        solver_task.cancel()
                                     print(selected_file)
                                     deck = Deck.load_deck_from_file(selected_file)
                                     deck.update(None, display_dimensions[1])
+                                    hm = history_manager.HistoryManager(deck)
+                                    solution_steps = None
                             if button.action == "new_deck":
+                                if solver_task is not None:
+                                    solver_task.cancel()
                                 deck = Deck()
                                 deck.add_all_cards()
                                 deck.shuffle_cards()
                                 deck.load_piles(display_dimensions)
                                 deck.update(None, display_dimensions[1])
+                                hm = history_manager.HistoryManager(deck)
+                                solution_steps = None
                             if button.action == "save_state":
                                 save_deck_to_file(deck)
                             if button.action == "back_to_menu":
                                 start_menu()
+                                screen.invalidate()
                             if button.action == "quit":
                                 quit_game()
 
                 if event.button == 3:
                     deck.handle_right_click(mouse_pos)
 
-        dark_green = (41, 71, 38)
-        game_display.fill(dark_green)
-
-        for button in buttons:
-            button.display(game_display, pygame.mouse.get_pos())
-
-        deck.display(game_display)
-        pygame.display.update()
+        screen.render(game_display, deck, active_buttons, pygame.mouse.get_pos())
         clock.tick(FPS)
 
 def start_menu():
@@ -247,9 +283,9 @@ def tutorial_screen():
         "5. You can move a card or a sequence of cards to another tableau pile.",
         "6. Empty tableau piles can be filled with any card or sequence.",
         "7. Use the 'DFS' button to get a hint using Depth-First Search.",
-        "8. Use the 'A*' button to get a hint using A* algorithm.",
+        "8. Use the 'A*' or 'IDA*' buttons to get a hint using A* or its low-memory variant.",
         "9. After using DFS or A*, press 'Next' to follow the solution.",
-        "10. Use 'Undo' to revert your last move.",
+        "10. Use 'Undo' to revert your last move and 'Redo' to play it again.",
         "11. 'Save State' and 'Load State' let you save and resume games."
     ]
     
@@ -324,94 +360,15 @@ def high_scores():
 
 def start_menu():
     title = Text(display_dimensions, (0, -200), "FreeCell", 80, black)
+    shadow_offset = 3
+    shadow_title = Text(display_dimensions, (shadow_offset, -200 + shadow_offset), "FreeCell", 80, grey)
     subtitle = Text(display_dimensions, (0, -130), "Card Game", 30, dark_green)
     
-    card_back = None
-    card_faces = []
-    
-    possible_card_back_paths = [
-        os.path.join("game", "resources", "card_back.png"),
-        os.path.join("resources", "card_back.png"),
-        os.path.join("assets", "card_back.png"),
-        os.path.join("..", "resources", "card_back.png"),
-        os.path.join(".", "resources", "card_back.png")
-    ]
-    
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    for rel_path in possible_card_back_paths:
-        try:
-            full_path = os.path.join(current_dir, rel_path)
-            if os.path.exists(full_path):
-                card_back = pygame.image.load(full_path)
-                card_back = pygame.transform.scale(card_back, (40, 60))
-                break
-        except Exception as e:
-            continue
-    
-    if not card_back:
-        try:
-            temp_deck = Deck()
-            if hasattr(temp_deck, 'card_back_image') and temp_deck.card_back_image is not None:
-                card_back = pygame.transform.scale(temp_deck.card_back_image, (40, 60))
-        except Exception as e:
-            print(f"Error loading card back from deck: {e}")
-    
-    hearts_loaded = False
-    try:
-        hearts_ranks = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
-        for rank in hearts_ranks:
-            card_path = os.path.join("assets", f"{rank}_of_hearts.png")
-            if os.path.exists(card_path):
-                img = pygame.image.load(card_path)
-                scaled_img = pygame.transform.scale(img, (40, 60))
-                card_faces.append(scaled_img)
-                hearts_loaded = True
-    except Exception as e:
-        print(f"Error loading hearts cards: {e}")
-    
-    if not hearts_loaded:
-        try:
-            temp_deck = Deck()
-            temp_deck.add_all_cards()
-            
-            if hasattr(temp_deck, 'card_images') and temp_deck.card_images:
-                for card_name, img in temp_deck.card_images.items():
-                    if 'hearts' in card_name and img is not None:
-                        scaled_img = pygame.transform.scale(img, (40, 60))
-                        card_faces.append(scaled_img)
-                
-                if len(card_faces) < 5:
-                    for card_name, img in temp_deck.card_images.items():
-                        if img is not None and 'hearts' not in card_name:
-                            scaled_img = pygame.transform.scale(img, (40, 60))
-                            card_faces.append(scaled_img)
-                            if len(card_faces) >= 10:
-                                break
-        except Exception as e:
-            print(f"Error loading cards from deck: {e}")
-    
-    if len(card_faces) < 5:
-        try:
-            suits = ['clubs', 'diamonds', 'spades']
-            ranks = ['ace', 'king', 'queen', 'jack']
-            
-            for suit in suits:
-                for rank in ranks:
-                    if len(card_faces) >= 10:
-                        break
-                    try:
-                        card_path = os.path.join("assets", f"{rank}_of_{suit}.png")
-                        if os.path.exists(card_path):
-                            img = pygame.image.load(card_path)
-                            scaled_img = pygame.transform.scale(img, (40, 60))
-                            card_faces.append(scaled_img)
-                    except:
-                        pass
-        except Exception as e:
-            print(f"Error loading additional cards: {e}")
-    
-    
+    # Faces and back come from the shared card atlas, scaled once for the menu
+    menu_cards = renderer.card_atlas((40, 60))
+    card_back = menu_cards.back
+    card_faces = [face for face in (menu_cards.face(rank, 'hearts') for rank in renderer.RANKS) if face]
+
     button_width = 200
     button_height = 60
     button_spacing = 30
@@ -454,6 +411,7 @@ def start_menu():
     card_speeds = [random.randint(4, 8) for _ in range(num_cards)]  # Increased speed range from 2-5 to 4-8
     card_depths = [random.uniform(0.5, 1.0) for _ in range(num_cards)]
     card_rotations = [random.randint(-15, 15) for _ in range(num_cards)]
+    menu_background = renderer.vertical_gradient(display_dimensions, (41, 71, 38))
     
     while True:
         animation_time += 1
@@ -480,19 +438,7 @@ def start_menu():
         if background_image:
             game_display.blit(background_image, (0, 0))
         else:
-            dark_green_rgb = (41, 71, 38)
-            
-            for y in range(0, display_dimensions[1], 2):
-                intensity = 1 - (y / display_dimensions[1])
-                
-                color_value = (
-                    int(dark_green_rgb[0] * intensity),
-                    int(dark_green_rgb[1] * intensity),
-                    int(dark_green_rgb[2] * intensity)
-                )
-                
-                pygame.draw.rect(game_display, color_value, 
-                                [0, y, display_dimensions[0], 2])
+            game_display.blit(menu_background, (0, 0))
 
         for i in range(len(card_positions)):
             card_positions[i] = (card_positions[i][0], card_positions[i][1] + card_speeds[i])
@@ -508,71 +454,17 @@ def start_menu():
                 use_card_back = (i % 3 == 0)
             
             if use_card_back and card_back:
-                card_surface = pygame.Surface((40, 60), pygame.SRCALPHA)
-                card_surface.blit(card_back, (0, 0))
-                
-                if card_depths[i] < 0.8:
-                    blur_strength = int((1 - card_depths[i]) * 10)
-                    overlay = pygame.Surface((40, 60), pygame.SRCALPHA)
-                    overlay.fill((255, 255, 255, blur_strength * 20))
-                    card_surface.blit(overlay, (0, 0))
-                
-                scale_factor = 0.7 + (0.3 * card_depths[i])
-                scaled_width = int(40 * scale_factor)
-                scaled_height = int(60 * scale_factor)
-                scaled_card = pygame.transform.scale(card_surface, (scaled_width, scaled_height))
-                
-                rotated_card = pygame.transform.rotate(scaled_card, card_rotations[i])
-                
-                rot_rect = rotated_card.get_rect(center=(card_positions[i][0] + scaled_width//2, 
-                                                        card_positions[i][1] + scaled_height//2))
-                
-                game_display.blit(rotated_card, rot_rect.topleft)
+                face = card_back
             elif card_faces and len(card_faces) > 0:
-                card_idx = i % len(card_faces)
-                card_surface = pygame.Surface((40, 60), pygame.SRCALPHA)
-                card_surface.blit(card_faces[card_idx], (0, 0))
-                
-                if card_depths[i] < 0.8:
-                    blur_strength = int((1 - card_depths[i]) * 10)
-                    overlay = pygame.Surface((40, 60), pygame.SRCALPHA)
-                    overlay.fill((255, 255, 255, blur_strength * 20))
-                    card_surface.blit(overlay, (0, 0))
-                
-                scale_factor = 0.7 + (0.3 * card_depths[i])
-                scaled_width = int(40 * scale_factor)
-                scaled_height = int(60 * scale_factor)
-                scaled_card = pygame.transform.scale(card_surface, (scaled_width, scaled_height))
-                
-                rotated_card = pygame.transform.rotate(scaled_card, card_rotations[i])
-                
-                rot_rect = rotated_card.get_rect(center=(card_positions[i][0] + scaled_width//2, 
-                                                        card_positions[i][1] + scaled_height//2))
-                
-                game_display.blit(rotated_card, rot_rect.topleft)
+                face = card_faces[i % len(card_faces)]
             else:
-                scale_factor = 0.7 + (0.3 * card_depths[i])
-                rect_width = int(40 * scale_factor)
-                rect_height = int(60 * scale_factor)
-                
-                rect_surface = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
-                
-                color_value = int(220 * card_depths[i])
-                border_value = int(180 * card_depths[i])
-                pygame.draw.rect(rect_surface, (color_value, color_value, color_value), 
-                               [0, 0, rect_width, rect_height], 0, 3)
-                pygame.draw.rect(rect_surface, (border_value, border_value, border_value), 
-                               [0, 0, rect_width, rect_height], 1, 3)
-                
-                rotated_rect = pygame.transform.rotate(rect_surface, card_rotations[i])
-                
-                rot_rect = rotated_rect.get_rect(center=(card_positions[i][0] + rect_width//2, 
-                                                        card_positions[i][1] + rect_height//2))
-                
-                game_display.blit(rotated_rect, rot_rect.topleft)
-
-        shadow_offset = 3
-        shadow_title = Text(display_dimensions, (shadow_offset, -200 + shadow_offset), "FreeCell", 80, grey)
+                face = None
+
+            sprite, (card_width, card_height) = renderer.falling_card_sprite(face, card_depths[i], card_rotations[i])
+            rot_rect = sprite.get_rect(center=(card_positions[i][0] + card_width//2,
+                                               card_positions[i][1] + card_height//2))
+            game_display.blit(sprite, rot_rect.topleft)
+
         shadow_title.display(game_display)
         title.display(game_display)
         subtitle.display(game_display)
@@ -608,15 +500,12 @@ def save_deck_to_file(deck):
     states_folder = "states"
     if not os.path.exists(states_folder):
         os.makedirs(states_folder)
-    existing_files = [f for f in os.listdir(states_folder) if re.match(r"deck(\d+)\.txt$", f)]
-    existing_numbers = sorted([int(re.search(r"deck(\d+)\.txt$", f).group(1)) for f in existing_files])
+    matches = (re.match(r"deck(\d+)\.txt$", f) for f in os.listdir(states_folder))
+    existing_numbers = {int(match.group(1)) for match in matches if match}
 
     next_index = 1
-    for num in existing_numbers:
-        if num == next_index:
-            next_index += 1
-        else:
-            break
+    while next_index in existing_numbers:
+        next_index += 1
     file_path = os.path.join(states_folder, f"deck{next_index}.txt")
 
     with open(file_path, "w") as file:
@@ -1,6 +1,6 @@
 import time
 import tracemalloc
-from searchAlgorithms import ASTAR, BFS, Greedy, DFS
+from searchAlgorithms import ASTAR, BFS, Greedy, DFS, IDASTAR
 from deck import Deck
 import matplotlib
 
@@ -19,12 +19,8 @@ def run_algorithm(algorithm, deck):
     current, peak = tracemalloc.get_traced_memory()
     tracemalloc.stop()
 
-    # Check if the algorithm has visited_states attribute
-    states_count = 0
-    if hasattr(algorithm, 'visited_states'):
-        states_count = len(algorithm.visited_states)
-    elif hasattr(algorithm, 'visited'):  # Some implementations might use 'visited' instead
-        states_count = len(algorithm.visited)
+    # States expanded, as counted by the search's budget meter
+    states_count = algorithm.meter.nodes if algorithm.meter is not None else 0
     
     return {
         'time_spent': end_time - start_time,
@@ -37,6 +33,7 @@ def main():
     deck = Deck.load_deck_from_file("states/deck8.txt")
     algorithms = {
         'A*': ASTAR(),
+        'IDA*': IDASTAR(),
         'Greedy': Greedy(),
         'BFS': BFS(),
         'DFS': DFS()
@@ -1,24 +1,87 @@
-from copy import deepcopy
 from deck import CompressedDeck
 
+CHECKPOINT_EVERY = 32  # moves between two stored positions
+
+
 class HistoryManager:
-    def __init__(self, deck):
-        self.current_deck = 0
-        self.decks = []
-        self.add_deck(deck)
+    """
+    Undo/redo history of one game, stored as the moves played
+    (source, target, num_cards) rather than a copy of the board per move.
+
+    Undo and redo move the cards of the live Deck back or forth one move, so
+    both are O(1) whatever the length of the game. Undone moves are kept for
+    redo until a new move is played. Every ``checkpoint_every`` moves the
+    position is also kept as a CompressedDeck, so ``state_at`` rebuilds any
+    point of the game by replaying at most that many moves.
+    """
+
+    def __init__(self, deck, checkpoint_every=CHECKPOINT_EVERY):
+        self.checkpoint_every = checkpoint_every
+        self.state = CompressedDeck(deck.piles, deck.card_size, deck.ranks)
+        self.moves = []  # every move played, including undone ones
+        self.position = 0  # number of moves currently on the board
+        self.checkpoints = [self.state.snapshot()]  # position i * checkpoint_every
+
+    def __len__(self):
+        return len(self.moves)
 
-    def add_deck(self, deck):
-        self.decks.append(CompressedDeck(deck.piles, deck.card_size, deck.ranks))
+    def can_undo(self):
+        return self.position > 0
 
-    def valid_move_made(self, deck):
-        if self.current_deck < len(self.decks) - 1:
-            self.decks = self.decks[:self.current_deck + 1]
-        self.add_deck(deck)
-        self.current_deck += 1
+    def can_redo(self):
+        return self.position < len(self.moves)
+
+    def valid_move_made(self, move):
+        """
+        Records a move just played on the board (``Deck.last_move``). Any
+        undone moves are dropped.
+        """
+        if move is None:
+            return
+        if self.can_redo():
+            del self.moves[self.position:]
+            del self.checkpoints[self.position // self.checkpoint_every + 1:]
+        self._advance(move)
+        self.moves.append(move)
 
     def undo(self, deck):
-        if self.current_deck > 0:
-            self.current_deck -= 1
-            return deepcopy(self.decks[self.current_deck]).decompress()
-        else:
-            return deck
\ No newline at end of file
+        """
+        Takes back the last move on ``deck`` (in place) and returns the deck.
+        """
+        if not self.can_undo():
+            return deck
+        self.position -= 1
+        source, target, num_cards = self.moves[self.position]
+        self.state.undo_move((source, target, num_cards))
+        deck.apply_move((target, source, num_cards))
+        return deck
+
+    def redo(self, deck):
+        """
+        Plays the last undone move on ``deck`` again and returns the deck.
+        """
+        if not self.can_redo():
+            return deck
+        move = self.moves[self.position]
+        self._advance(move)
+        deck.apply_move(move)
+        return deck
+
+    def _advance(self, move):
+        self.state.apply_move(move)
+        self.position += 1
+        if self.position % self.checkpoint_every == 0 and len(self.checkpoints) == self.position // self.checkpoint_every:
+            self.checkpoints.append(self.state.snapshot())
+
+    def state_at(self, position):
+        """
+        The CompressedDeck after the first ``position`` moves, rebuilt from
+        the nearest checkpoint.
+        """
+        if not 0 <= position <= len(self.moves):
+            raise IndexError(f"history position {position} out of range")
+        checkpoint = min(position // self.checkpoint_every, len(self.checkpoints) - 1)
+        state = self.checkpoints[checkpoint].snapshot()
+        for move in self.moves[checkpoint * self.checkpoint_every:position]:
+            state.apply_move(move)
+        return state
@@ -0,0 +1,191 @@
+from deck import CARD_RANK, CARD_SUIT, CARD_RED, EMPTY
+
+# PLACE_ON[code] -> the two cards ``code`` may be stacked on in a tableau
+# (one rank higher, opposite colour).
+PLACE_ON = tuple(
+    tuple(suit * 13 + CARD_RANK[code] + 1 for suit in range(4) if (suit in (1, 2)) != CARD_RED[code])
+    if CARD_RANK[code] < 12 else ()
+    for code in range(52)
+)
+
+# STACKS_ON[upper * 52 + lower] is 1 if ``lower`` may sit on ``upper``.
+STACKS_ON = bytes(
+    CARD_RANK[upper] == CARD_RANK[lower] + 1 and CARD_RED[upper] != CARD_RED[lower]
+    for upper in range(52)
+    for lower in range(52)
+)
+
+# Suits of the opposite colour, indexed by CARD_RED
+OPPOSITE_SUITS = ((1, 2), (0, 3))
+
+_run_cache = {}
+_RUN_CACHE_LIMIT = 200000
+
+
+def movable_run_length(column):
+    """
+    Number of cards at the top of ``column`` that form a descending,
+    alternating-colour run. Columns are immutable bytes shared between
+    states, so the result is cached per column value.
+    """
+    length = _run_cache.get(column)
+    if length is None:
+        length = 1 if column else 0
+        for i in range(len(column) - 1, 0, -1):
+            if not STACKS_ON[column[i - 1] * 52 + column[i]]:
+                break
+            length += 1
+        if len(_run_cache) >= _RUN_CACHE_LIMIT:
+            _run_cache.clear()
+        _run_cache[column] = length
+    return length
+
+
+def foundation_targets(state):
+    """
+    Returns (counts, suit_foundation, empty_foundation): cards home per suit,
+    the foundation pile building each suit, and the first empty foundation pile.
+    """
+    layout = state.layout
+    counts = [0, 0, 0, 0]
+    suit_foundation = [None, None, None, None]
+    empty_foundation = None
+    for slot, top in enumerate(state.foundations):
+        if top == EMPTY:
+            if empty_foundation is None:
+                empty_foundation = layout.foundation_piles[slot]
+        else:
+            counts[CARD_SUIT[top]] = CARD_RANK[top] + 1
+            suit_foundation[CARD_SUIT[top]] = layout.foundation_piles[slot]
+    return counts, suit_foundation, empty_foundation
+
+
+def is_safe_autoplay(code, counts):
+    """
+    A card may go home without losing anything if it is next for its suit and
+    both opposite-colour cards one rank lower are already home (aces and twos
+    always qualify): nothing could still need to be built on it.
+    """
+    rank = CARD_RANK[code]
+    if rank != counts[CARD_SUIT[code]]:
+        return False
+    if rank <= 1:
+        return True
+    low, high = OPPOSITE_SUITS[CARD_RED[code]]
+    return counts[low] >= rank and counts[high] >= rank
+
+
+def safe_autoplay_move(state):
+    """
+    Returns one safe foundation move from a tableau column or free cell, or None.
+    """
+    counts, suit_foundation, empty_foundation = foundation_targets(state)
+    layout = state.layout
+
+    for slot, column in enumerate(state.tableau):
+        if column and is_safe_autoplay(column[-1], counts):
+            target = empty_foundation if CARD_RANK[column[-1]] == 0 else suit_foundation[CARD_SUIT[column[-1]]]
+            if target is not None:
+                return layout.tableau_piles[slot], target, 1
+    for slot, code in enumerate(state.free_cells):
+        if code != EMPTY and is_safe_autoplay(code, counts):
+            target = empty_foundation if CARD_RANK[code] == 0 else suit_foundation[CARD_SUIT[code]]
+            if target is not None:
+                return layout.free_cell_piles[slot], target, 1
+    return None
+
+
+def supermove_capacity(free_cells, empty_columns, to_empty_column=False):
+    """
+    Longest run that can be moved through ``free_cells`` empty free cells and
+    ``empty_columns`` empty columns: (free_cells + 1) * 2 ** empty_columns.
+    When the target is itself one of the empty columns it cannot be used as
+    scratch space, which halves the capacity.
+    """
+    if to_empty_column:
+        empty_columns -= 1
+    return (free_cells + 1) << empty_columns
+
+
+def generate_moves(state):
+    """
+    Returns every distinct move from ``state`` as (source, target, num_cards)
+    using ``Deck.piles`` indices.
+
+    Moves that only differ by which empty column or empty free cell they use
+    lead to the same canonical state, so only the first empty column and the
+    first empty free cell are offered as targets. Moving a whole column into
+    an empty column and moving between free cells are never generated.
+
+    Runs move as one supermove per (source run length, target): onto a card
+    only one run length fits, while into an empty column every length up to
+    the longest that fits is offered. See ``supermove_capacity``.
+    """
+    layout = state.layout
+    tableau = state.tableau
+    tableau_piles = layout.tableau_piles
+    free_cells = state.free_cells
+
+    tops = {}  # top card -> tableau pile index, for direct targeting
+    empty_column = None
+    empty_tableaus = 0
+    for slot, column in enumerate(tableau):
+        if column:
+            tops[column[-1]] = tableau_piles[slot]
+        else:
+            empty_tableaus += 1
+            if empty_column is None:
+                empty_column = tableau_piles[slot]
+
+    free_cell = None
+    free_cell_count = 0
+    for slot, code in enumerate(free_cells):
+        if code == EMPTY:
+            free_cell_count += 1
+            if free_cell is None:
+                free_cell = layout.free_cell_piles[slot]
+
+    counts, suit_foundation, empty_foundation = foundation_targets(state)
+
+    capacity = supermove_capacity(free_cell_count, empty_tableaus)
+    if empty_column is not None:
+        empty_capacity = supermove_capacity(free_cell_count, empty_tableaus, to_empty_column=True)
+    valid_moves = []
+
+    def single_card_moves(source, code, column):
+        # column is None when the card comes from a free cell
+        for target in PLACE_ON[code]:
+            target_pile = tops.get(target)
+            if target_pile is not None:
+                valid_moves.append((source, target_pile, 1))
+        if empty_column is not None and (column is None or len(column) > 1):
+            valid_moves.append((source, empty_column, 1))
+        if free_cell is not None and column is not None:
+            valid_moves.append((source, free_cell, 1))
+        if CARD_RANK[code] == counts[CARD_SUIT[code]]:
+            target = empty_foundation if CARD_RANK[code] == 0 else suit_foundation[CARD_SUIT[code]]
+            if target is not None:
+                valid_moves.append((source, target, 1))
+
+    for slot, column in enumerate(tableau):
+        if not column:
+            continue
+        source = tableau_piles[slot]
+        single_card_moves(source, column[-1], column)
+
+        run = movable_run_length(column)
+        for num_cards in range(2, min(run, capacity) + 1):
+            for target in PLACE_ON[column[-num_cards]]:
+                target_pile = tops.get(target)
+                if target_pile is not None:
+                    valid_moves.append((source, target_pile, num_cards))
+
+        if empty_column is not None:
+            for num_cards in range(2, min(run, empty_capacity, len(column) - 1) + 1):
+                valid_moves.append((source, empty_column, num_cards))
+
+    for slot, code in enumerate(free_cells):
+        if code != EMPTY:
+            single_card_moves(layout.free_cell_piles[slot], code, None)
+
+    return valid_moves
@@ -0,0 +1,372 @@
+import multiprocessing
+import os
+import queue
+from copy import copy
+from time import time
+from budget import BudgetExceeded
+from deck import CompressedDeck
+from frontier import PriorityFrontier
+from searchAlgorithms import ASTAR
+
+BATCH_SIZE = 64  # states per message between workers
+EXPANSIONS_PER_ROUND = 32  # expansions between two looks at the inbox
+RESULT_POLL = 0.1  # seconds the controller waits for a message before checking on the workers
+
+
+class WorkerLost(RuntimeError):
+    """A worker process exited while the controller still needed it."""
+
+
+def _owner(key, workers):
+    return key % workers
+
+
+def _hda_worker(worker_id, workers, inboxes, results, stop_event, layout, weight, autoplay, budget, start_time):
+    """
+    One HDA* worker. It owns the states whose key hashes to ``worker_id``:
+    their open list, closed table and parent records. Children owned by
+    other workers are sent to them in batches of ``BATCH_SIZE``.
+
+    Parent records are referred to as (worker, index) rather than by state
+    key: keys ignore column order, while the recorded moves only make sense
+    for the exact column order of the path that generated them.
+
+    Messages on the inbox: ("states", batch), ("probe", wave), ("trace", index),
+    ("exit",). Messages to the controller: ("goal", ref), ("idle", id, sent,
+    received), ("busy", id), ("status", wave, id, idle, sent, received),
+    ("exceeded", id, reason), ("stats", id, expansions, seconds, best_home,
+    best_ref) and ("trace", parent_ref, applied). ``sent`` and ``received``
+    count "states" batches.
+    """
+    solver = ASTAR(weight=weight, autoplay=autoplay, budget=budget)
+    heuristic = solver.heuristic
+    meter = solver.start_meter(start_time)
+    inbox = inboxes[worker_id]
+
+    frontier = PriorityFrontier()
+    table = solver.closed_set()
+    records = []  # (parent ref, moves applied from the parent) per accepted state
+    outgoing = [[] for _ in range(workers)]
+    sent = received = 0
+    idle_reported = False
+    searching = True
+    best_home, best_ref = -1, None
+
+    def receive(batch):
+        for tableau, free_cells, foundations, key, g, parent_ref, applied in batch:
+            if table.record(key, g):
+                records.append((parent_ref, applied))
+                state = CompressedDeck.from_parts(layout, list(tableau), bytearray(free_cells),
+                                                  bytearray(foundations), key)
+                frontier.push((len(records) - 1, state), g + weight * heuristic(state), key, g)
+
+    def flush(force):
+        nonlocal sent
+        for target, batch in enumerate(outgoing):
+            if batch and (force or len(batch) >= BATCH_SIZE):
+                inboxes[target].put(("states", batch))
+                outgoing[target] = []
+                sent += 1
+
+    def finish():
+        nonlocal searching
+        searching = False
+        results.put(("stats", worker_id, meter.nodes, time() - start_time, best_home, best_ref))
+
+    while True:
+        if searching and stop_event.is_set():
+            finish()
+
+        idle = not searching or not frontier
+        if idle and searching and not idle_reported:
+            results.put(("idle", worker_id, sent, received))
+            idle_reported = True
+        try:
+            message = inbox.get(timeout=0.05) if idle else inbox.get_nowait()
+        except queue.Empty:
+            message = None
+
+        while message is not None:
+            if message[0] == "states":
+                received += 1
+                if searching:
+                    receive(message[1])
+                    if idle_reported:
+                        # The idle report no longer holds
+                        results.put(("busy", worker_id))
+                        idle_reported = False
+            elif message[0] == "probe":
+                results.put(("status", message[1], worker_id, searching and not frontier and not any(outgoing),
+                             sent, received))
+            elif message[0] == "trace":
+                results.put(("trace", *records[message[1]]))
+            elif message[0] == "exit":
+                return
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                message = None
+
+        if not searching:
+            continue
+
+        for _ in range(EXPANSIONS_PER_ROUND):
+            if not frontier:
+                break
+            (index, state), _, g = frontier.pop()
+            ref = (worker_id, index)
+            if state.check_for_win():
+                results.put(("goal", ref))
+                flush(True)
+                finish()
+                break
+
+            home = sum(state.foundation_counts())
+            if home > best_home:
+                best_home, best_ref = home, ref
+            if meter.charge(len(frontier)):
+                results.put(("exceeded", worker_id, meter.exceeded))
+                finish()
+                break
+
+            child_g = g + 1
+            for move in solver.get_valid_moves(state):
+                applied = solver.expand(state, move)
+                child_key = state.key()
+                outgoing[_owner(child_key, workers)].append(
+                    (tuple(state.tableau), bytes(state.free_cells), bytes(state.foundations), child_key, child_g,
+                     ref, applied))
+                solver.retract(state, applied)
+            flush(False)
+
+        if searching:
+            flush(not frontier)
+
+
+def _check_workers(processes):
+    dead = [(worker_id, process.exitcode) for worker_id, process in enumerate(processes) if not process.is_alive()]
+    if dead:
+        raise WorkerLost(", ".join(f"worker {worker_id} exited with code {code}" for worker_id, code in dead))
+
+
+def _balanced(counts):
+    """
+    True if the (sent, received) batch counts of all workers add up, the
+    root batch the controller sent included.
+    """
+    counts = list(counts)
+    return 1 + sum(sent for sent, _ in counts) == sum(received for _, received in counts)
+
+
+class HDASTAR(ASTAR):
+    """
+    Hash-distributed A*: one search whose open and closed lists are split
+    across worker processes by state key (key % workers). Each worker
+    expands only the states it owns and sends generated children to their
+    owners in batches, so duplicate detection needs no shared table.
+
+    The search ends at the first goal any worker expands, when every worker
+    is idle with no batches in flight (see ``_wait_for_outcome``), or when a
+    worker runs out of budget. If a worker process dies, the search returns
+    a BudgetExceeded with reason "worker" and no partial state.
+    Node and memory limits apply per worker (the node limit is split evenly).
+    ``worker_stats`` holds the expansions and expansion rate of each worker.
+    """
+
+    def __init__(self, workers=None, weight=1, autoplay=True, budget=None):
+        super().__init__(weight=weight, autoplay=autoplay, budget=budget)
+        self.workers = workers or os.cpu_count() or 1
+        self.worker_stats = []
+
+    def run(self, board, score):
+        print(f"Starting HDA* with {self.workers} workers...")
+        start_time = time()
+        compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
+
+        solution_moves = self.solve(compressed_board)
+
+        if isinstance(solution_moves, BudgetExceeded):
+            self.budget_exceeded(solution_moves, score)
+            return
+
+        if solution_moves is None:
+            print("No solution found.")
+            score[0] = None
+            score[1] = time() - start_time
+            return
+
+        self.solution_found(score, compressed_board, solution_moves, start_time)
+
+        print("Solution found!")
+        print("Number of moves:", score[2])
+        for stats in self.worker_stats:
+            print(f"Worker {stats['worker']}: {stats['expansions']} expansions, {stats['rate']:.0f}/s")
+        print("Total time:", score[1], "seconds")
+
+    def solve(self, initial_state):
+        return self.hda_star_search(initial_state)
+
+    def hda_star_search(self, initial_state):
+        """
+        Returns the list of moves to a win, None, or a BudgetExceeded result.
+        """
+        start_time = time()
+        self.worker_stats = []
+        state = initial_state.snapshot()
+        settled = tuple(self.settle(state, state.apply_move))
+        if state.check_for_win():
+            return list(settled)
+
+        workers = self.workers
+        budget = copy(self.budget)
+        if budget.max_nodes is not None:
+            budget.max_nodes = max(1, budget.max_nodes // workers)
+
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(workers)]
+        results = context.Queue()
+        stop_event = context.Event()
+        processes = [context.Process(target=_hda_worker,
+                                     args=(worker_id, workers, inboxes, results, stop_event, state.layout,
+                                           self.weight, self.autoplay, budget, start_time),
+                                     daemon=True)
+                     for worker_id in range(workers)]
+        for process in processes:
+            process.start()
+
+        root_key = state.key()
+        inboxes[_owner(root_key, workers)].put(
+            ("states", [(tuple(state.tableau), bytes(state.free_cells), bytes(state.foundations), root_key, 0,
+                         None, settled)]))
+
+        try:
+            goal_ref, exceeded = self._wait_for_outcome(results, inboxes, processes, start_time)
+            stop_event.set()
+            stats = self._collect_stats(results, processes)
+            self.worker_stats = [
+                {"worker": worker_id, "expansions": expansions, "seconds": seconds,
+                 "rate": expansions / seconds if seconds > 0 else 0.0}
+                for worker_id, (expansions, seconds, _, _) in sorted(stats.items())
+            ]
+
+            if goal_ref is not None:
+                return self._trace(goal_ref, inboxes, results, processes)
+            if exceeded is None:
+                return None
+
+            partial, moves = None, None
+            candidates = [(home, ref) for _, _, home, ref in stats.values() if ref is not None]
+            if candidates:
+                moves = self._trace(max(candidates)[1], inboxes, results, processes)
+                partial = initial_state.snapshot()
+                for move in moves:
+                    partial.apply_move(move)
+            return BudgetExceeded(exceeded, sum(s["expansions"] for s in self.worker_stats), time() - start_time,
+                                  partial, moves)
+        except WorkerLost as error:
+            print(f"HDA* stopped: {error}")
+            return BudgetExceeded("worker", sum(s["expansions"] for s in self.worker_stats), time() - start_time,
+                                  None, None)
+        finally:
+            for inbox in inboxes:
+                inbox.put(("exit",))
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+    def _wait_for_outcome(self, results, inboxes, processes, start_time):
+        """
+        Returns (goal ref, None) when a goal is found, (None, reason) when a
+        worker ran out of budget and (None, None) when the search space is
+        exhausted. Raises WorkerLost if a worker process exits.
+
+        Idle reports only suggest exhaustion: a report can be outdated by the
+        time the others arrive, and the counts of a worker that took and
+        passed on work since its report cancel out. Once every worker has an
+        idle report on record (a "busy" message withdraws one) and the batch
+        counts balance, all workers are probed. The search space is only
+        exhausted when two probe waves in a row find every worker idle with
+        the same, balanced counts; otherwise the controller waits for new
+        idle reports.
+        """
+        workers = len(inboxes)
+        statuses = {}  # worker -> (sent, received) of its idle report, while it holds
+        wave, replies, previous = 0, None, None  # current probe wave, its replies, last balanced wave's counts
+        time_limit = self.budget.time_limit
+
+        def probe():
+            nonlocal wave, replies
+            wave += 1
+            replies = {}
+            for inbox in inboxes:
+                inbox.put(("probe", wave))
+
+        while True:
+            try:
+                message = results.get(timeout=RESULT_POLL)
+            except queue.Empty:
+                if time_limit is not None and time() - start_time > time_limit + 1:
+                    return None, "time"
+                _check_workers(processes)
+                continue
+
+            kind = message[0]
+            if kind == "goal":
+                return message[1], None
+            if kind == "exceeded":
+                return None, message[2]
+            if kind == "idle":
+                statuses[message[1]] = (message[2], message[3])
+                if replies is None and len(statuses) == workers and _balanced(statuses.values()):
+                    probe()
+            elif kind == "busy":
+                statuses.pop(message[1], None)
+            elif kind == "status" and message[1] == wave and replies is not None:
+                _, _, worker_id, idle, sent, received = message
+                replies[worker_id] = (idle, sent, received)
+                if len(replies) < workers:
+                    continue
+                counts = sorted(replies.items())
+                if all(idle for idle, _, _ in replies.values()) and _balanced(
+                        (sent, received) for _, sent, received in replies.values()):
+                    if counts == previous:
+                        return None, None
+                    previous = counts
+                    probe()
+                else:
+                    replies, previous = None, None
+
+    def _receive(self, results, processes, kind):
+        """
+        Next message of ``kind`` from the workers, skipping any others.
+        Raises WorkerLost if a worker process exits while waiting.
+        """
+        while True:
+            try:
+                message = results.get(timeout=RESULT_POLL)
+            except queue.Empty:
+                _check_workers(processes)
+                continue
+            if message[0] == kind:
+                return message
+
+    def _collect_stats(self, results, processes):
+        stats = {}
+        while len(stats) < len(processes):
+            message = self._receive(results, processes, "stats")
+            stats[message[1]] = message[2:]
+        return stats
+
+    def _trace(self, ref, inboxes, results, processes):
+        """
+        Follows parent records from ``ref`` back to the root, asking the worker
+        holding each record in turn. Returns the individual moves from the root.
+        """
+        steps = []
+        while ref is not None:
+            worker_id, index = ref
+            inboxes[worker_id].put(("trace", index))
+            _, ref, applied = self._receive(results, processes, "trace")
+            steps.append(applied)
+        return [move for applied in reversed(steps) for move in applied]
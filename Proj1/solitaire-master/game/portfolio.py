@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from copy import copy
+from time import time
+from budget import SearchBudget, BudgetExceeded
+from deck import CompressedDeck
+from searchAlgorithms import SolutionPath, ASTAR, Greedy, IDASTAR
+
+_cancel_event = None  # set in each worker by _init_worker
+
+
+def _init_worker(cancel_event):
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def _solve_in_worker(name, solver, initial_state):
+    """
+    Runs one solver of the portfolio in a worker process. The solver's budget
+    is tied to the portfolio's cancel event so it stops once another solver
+    has won.
+    """
+    budget = copy(solver.budget)
+    budget.cancel = _cancel_event
+    solver.budget = budget
+
+    start_time = time()
+    result = solver.solve(initial_state)
+    outcome = {
+        "solver": name,
+        "solved": isinstance(result, list),
+        "moves": result if isinstance(result, list) else None,
+        "reason": result.reason if isinstance(result, BudgetExceeded) else None,
+        "nodes": solver.meter.nodes if solver.meter is not None else 0,
+        "time": time() - start_time,
+    }
+    return outcome
+
+
+def default_solvers(budget=None):
+    """
+    A portfolio of differently-behaving searches: plain and low-weight A*
+    (shorter solutions), Greedy (fast) and IDA* (little memory).
+    """
+    return {
+        "A*": ASTAR(budget=budget),
+        "A* (w=0.2)": ASTAR(weight=0.2, budget=budget),
+        "Greedy": Greedy(budget=budget),
+        "IDA*": IDASTAR(budget=budget),
+    }
+
+
+class Portfolio:
+    """
+    Runs several solvers on the same state in parallel worker processes.
+
+    With ``mode="first"`` the first solution found is returned and the other
+    solvers are cancelled; with ``mode="best"`` every solver runs to the end
+    of its budget and the shortest solution wins. Solvers are cancelled
+    through their budget (see ``SearchBudget.cancel``), so they stop within
+    ``check_every`` expansions.
+    """
+
+    def __init__(self, solvers=None, mode="first", max_workers=None, budget=None):
+        if mode not in ("first", "best"):
+            raise ValueError(f"Unknown portfolio mode: {mode}")
+        self.solvers = solvers if solvers is not None else default_solvers(budget or SearchBudget())
+        self.mode = mode
+        self.max_workers = max_workers or min(len(self.solvers), os.cpu_count() or 1)
+        self.outcomes = []  # one dict per solver that finished, in finishing order
+
+    def solve(self, initial_state):
+        """
+        Returns the winning outcome dict (see ``_solve_in_worker``), or None if
+        no solver found a solution.
+        """
+        context = multiprocessing.get_context()
+        cancel_event = context.Event()
+        self.outcomes = []
+        best = None
+
+        with ProcessPoolExecutor(self.max_workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(cancel_event,)) as executor:
+            pending = {executor.submit(_solve_in_worker, name, solver, initial_state)
+                       for name, solver in self.solvers.items()}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    self.outcomes.append(outcome)
+                    if outcome["solved"] and (best is None or len(outcome["moves"]) < len(best["moves"])):
+                        best = outcome
+                if best is not None and self.mode == "first":
+                    cancel_event.set()
+                    for future in pending:
+                        future.cancel()
+                    break
+
+        return best
+
+    def run(self, board, score):
+        """
+        Same interface as the solvers' ``run``: fills ``score`` from a Deck.
+        """
+        start_time = time()
+        compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
+        best = self.solve(compressed_board)
+
+        score[1] = time() - start_time
+        if best is None:
+            print("No solver found a solution.")
+            score[0] = None
+            return
+
+        score[0] = SolutionPath(compressed_board, best["moves"])
+        score[2] = len(best["moves"])
+        score[3] = best["moves"]
+        score[5] = best["solver"]
+        print(f"{best['solver']} won with {score[2]} moves after {score[1]:.2f} seconds")
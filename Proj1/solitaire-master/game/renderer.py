@@ -0,0 +1,292 @@
+import os
+import pygame
+
+SUITS = ('clubs', 'diamonds', 'hearts', 'spades')
+RANKS = ('ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king')
+CARD_BACK_PATH = os.path.join('resources', 'card_back.png')
+
+# Raw images by file path, loaded from disk at most once per process
+_loaded_images = {}
+# card size -> CardAtlas
+_atlases = {}
+# (size, color, band height) -> baked gradient
+_gradients = {}
+# (face, depth bucket, rotation) -> (sprite, size before rotation)
+_card_sprites = {}
+
+# Falling menu cards are drawn at one of DEPTH_BUCKETS depths between 0.5
+# and 1.0 and rotated in ROTATION_STEP degree steps, so a few hundred
+# sprites cover the whole animation
+DEPTH_BUCKETS = 5
+ROTATION_STEP = 5
+
+
+def card_image_path(rank, suit):
+    return os.path.join('resources', 'cards', f'{rank}_of_{suit}.png')
+
+
+def load_image(path):
+    image = _loaded_images.get(path)
+    if image is None:
+        image = _loaded_images[path] = pygame.image.load(path)
+    return image
+
+
+class CardAtlas:
+    """
+    All 52 card faces (and the card back, if ``resources/card_back.png``
+    exists) pre-scaled to one card size and packed into a single surface:
+    one row per suit, with the back on a fifth row.
+
+    ``images`` maps each card's ``name_of_image`` to a subsurface of the
+    atlas, so drawing a card is a single blit. Once a display mode is set the
+    atlas is converted to the display's pixel format (``converted``).
+    """
+
+    def __init__(self, card_size):
+        self.card_size = card_size
+        width, height = card_size
+        self.surface = pygame.Surface((width * len(RANKS), height * (len(SUITS) + 1)), pygame.SRCALPHA)
+
+        placed = {}  # name_of_image (or None for the back) -> top-left corner
+        for row, suit in enumerate(SUITS):
+            for column, rank in enumerate(RANKS):
+                image_path = card_image_path(rank, suit)
+                try:
+                    image = load_image(image_path)
+                except FileNotFoundError:
+                    print(f"Warning: Card image not found: {image_path}")
+                    continue
+                placed[image_path] = (column * width, row * height)
+                self.surface.blit(pygame.transform.scale(image, card_size), placed[image_path])
+
+        if os.path.exists(CARD_BACK_PATH):
+            placed[None] = (0, len(SUITS) * height)
+            self.surface.blit(pygame.transform.scale(load_image(CARD_BACK_PATH), card_size), placed[None])
+
+        self.converted = pygame.display.get_surface() is not None
+        if self.converted:
+            self.surface = self.surface.convert_alpha()
+
+        self.images = {name: self.surface.subsurface(pygame.Rect(corner, card_size))
+                       for name, corner in placed.items() if name is not None}
+        self.back = self.surface.subsurface(pygame.Rect(placed[None], card_size)) if None in placed else None
+
+    def face(self, rank, suit):
+        return self.images.get(card_image_path(rank, suit))
+
+
+def card_atlas(card_size):
+    """
+    The process-wide atlas for ``card_size``, built on first use. An atlas
+    built before the display existed is rebuilt once so it can be converted.
+    """
+    card_size = tuple(card_size)
+    atlas = _atlases.get(card_size)
+    if atlas is None or (not atlas.converted and pygame.display.get_surface() is not None):
+        atlas = _atlases[card_size] = CardAtlas(card_size)
+    return atlas
+
+
+def card_images(card_size):
+    """
+    Card faces scaled to ``card_size``, keyed by the cards' ``name_of_image``.
+    """
+    return card_atlas(card_size).images
+
+
+def draw_deck(game_display, deck):
+    images = card_images(deck.card_size)
+    for pile in deck.piles:
+        draw_pile(game_display, deck, pile, images)
+
+
+def draw_pile(game_display, deck, pile, images):
+    if pile.pile_type == 'foundation' and len(pile.cards) == 0:
+        pygame.draw.rect(game_display, deck.empty_color,
+                         [pile.x, pile.y + 40, pile.card_width, pile.card_height])
+    if pile.pile_type == 'free-cell' and len(pile.cards) == 0:
+        pygame.draw.rect(game_display, deck.empty_color2,
+                         [pile.x, pile.y + 40, pile.card_width, pile.card_height])
+    for card in pile.cards:
+        if deck.selection and deck.selection_rect != None and card == deck.selected_cards[0]:
+            pygame.draw.rect(game_display, deck.selection_color, deck.selection_rect)
+
+        img = images[card.name_of_image]
+
+        game_display.blit(img, [card.x, card.y + 40])
+
+
+def _selection_in(deck, pile):
+    return deck.selection and deck.selection_rect is not None and deck.selected_cards[0] in pile.cards
+
+
+def pile_signature(deck, pile):
+    """
+    Everything that decides how ``pile`` looks: its cards and where they
+    are, and the selection highlight if the selection starts in this pile.
+    """
+    cards = tuple((card.name_of_image, card.position) for card in pile.cards)
+    selection = tuple(deck.selection_rect) if _selection_in(deck, pile) else None
+    return pile.pile_type, pile.x, pile.y, cards, selection
+
+
+def pile_area(deck, pile):
+    """
+    Screen rectangle covered by ``pile``, including an empty-pile marker and
+    the selection highlight.
+    """
+    area = pygame.Rect(pile.x, pile.y + 40, pile.card_width, pile.card_height)
+    for card in pile.cards:
+        area.union_ip(pygame.Rect(card.x, card.y + 40, pile.card_width, pile.card_height))
+    if _selection_in(deck, pile):
+        area.union_ip(pygame.Rect(deck.selection_rect))
+    return area
+
+
+class DirtyRectRenderer:
+    """
+    Draws the game screen by redrawing only what changed since the last frame.
+
+    Each frame every pile and button is compared with what was drawn last
+    (``pile_signature``, hover/enabled state for buttons). The areas that
+    differ, old and new position both, are cleared, everything overlapping
+    them is redrawn clipped to them, and only those rectangles are sent to
+    the screen with ``pygame.display.update(rects)``.
+
+    Call ``invalidate`` whenever something else has drawn over the screen
+    (another menu, a dialog) to get one full redraw.
+    """
+
+    def __init__(self, background_color):
+        self.background_color = background_color
+        self.full_redraw = True
+        self.pile_areas = {}  # pile index -> (signature, area) as last drawn
+        self.button_states = {}  # button -> (state, area) as last drawn
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def render(self, game_display, deck, buttons, mouse_pos):
+        """
+        Brings the screen up to date and returns the rectangles updated.
+        """
+        images = card_images(deck.card_size)
+        piles = list(enumerate(deck.piles))
+        dirty = []
+
+        pile_areas = {}
+        for index, pile in piles:
+            signature = pile_signature(deck, pile)
+            previous = self.pile_areas.get(index)
+            if previous is not None and previous[0] == signature:
+                pile_areas[index] = previous
+                continue
+            area = pile_area(deck, pile)
+            pile_areas[index] = (signature, area)
+            dirty.append(area if previous is None else area.union(previous[1]))
+        for index, (_, area) in self.pile_areas.items():
+            if index not in pile_areas:
+                dirty.append(area)
+        self.pile_areas = pile_areas
+
+        button_states = {}
+        for button in buttons:
+            state = (button.check_for_mouse_over(mouse_pos), button.enabled, button.text)
+            area = pygame.Rect(button.x, button.y, button.width, button.height)
+            previous = self.button_states.get(button)
+            if previous is None or previous[0] != state:
+                dirty.append(area)
+            button_states[button] = (state, area)
+        for button, (_, area) in self.button_states.items():
+            if button not in button_states:
+                dirty.append(area)
+        self.button_states = button_states
+
+        if self.full_redraw:
+            self.full_redraw = False
+            game_display.fill(self.background_color)
+            for button in buttons:
+                button.display(game_display, mouse_pos)
+            for _, pile in piles:
+                draw_pile(game_display, deck, pile, images)
+            pygame.display.update()
+            return [game_display.get_rect()]
+
+        for rect in dirty:
+            game_display.set_clip(rect)
+            game_display.fill(self.background_color)
+            for button, (_, area) in button_states.items():
+                if area.colliderect(rect):
+                    button.display(game_display, mouse_pos)
+            for index, pile in piles:
+                if pile_areas[index][1].colliderect(rect):
+                    draw_pile(game_display, deck, pile, images)
+        game_display.set_clip(None)
+
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
+
+
+def vertical_gradient(size, color, band_height=2):
+    """
+    Background fading from ``color`` at the top to black at the bottom,
+    drawn once per size and colour.
+    """
+    key = (tuple(size), tuple(color), band_height)
+    surface = _gradients.get(key)
+    if surface is None:
+        width, height = size
+        surface = pygame.Surface(size)
+        for y in range(0, height, band_height):
+            intensity = 1 - (y / height)
+            band_color = tuple(int(channel * intensity) for channel in color)
+            pygame.draw.rect(surface, band_color, [0, y, width, band_height])
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _gradients[key] = surface
+    return surface
+
+
+def falling_card_sprite(face, depth, rotation, card_size=(40, 60)):
+    """
+    Sprite of a falling menu card: ``face`` (a card image, or None for a
+    plain grey card) faded and shrunk with ``depth`` (0.5 far .. 1.0 near)
+    and rotated by ``rotation`` degrees. Depth and rotation are bucketed and
+    the sprite is cached, so steady-state frames only blit.
+
+    Returns (sprite, (width, height) of the card before rotation).
+    """
+    bucket = min(DEPTH_BUCKETS - 1, max(0, int((depth - 0.5) * 2 * DEPTH_BUCKETS)))
+    angle = ROTATION_STEP * round(rotation / ROTATION_STEP)
+    key = (face, bucket, angle, card_size)
+    cached = _card_sprites.get(key)
+    if cached is not None:
+        return cached
+
+    depth = 0.5 + (bucket + 0.5) / (2 * DEPTH_BUCKETS)
+    scale_factor = 0.7 + (0.3 * depth)
+    width, height = int(card_size[0] * scale_factor), int(card_size[1] * scale_factor)
+
+    if face is not None:
+        card_surface = pygame.Surface(card_size, pygame.SRCALPHA)
+        card_surface.blit(face, (0, 0))
+        if depth < 0.8:
+            blur_strength = int((1 - depth) * 10)
+            overlay = pygame.Surface(card_size, pygame.SRCALPHA)
+            overlay.fill((255, 255, 255, blur_strength * 20))
+            card_surface.blit(overlay, (0, 0))
+        card_surface = pygame.transform.scale(card_surface, (width, height))
+    else:
+        card_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        color_value = int(220 * depth)
+        border_value = int(180 * depth)
+        pygame.draw.rect(card_surface, (color_value, color_value, color_value), [0, 0, width, height], 0, 3)
+        pygame.draw.rect(card_surface, (border_value, border_value, border_value), [0, 0, width, height], 1, 3)
+
+    sprite = pygame.transform.rotate(card_surface, angle)
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    cached = _card_sprites[key] = (sprite, (width, height))
+    return cached
@@ -1,40 +1,119 @@
 from time import time
 from collections import deque
-from deck import CompressedDeck
+from frontier import PriorityFrontier
+from transposition import TranspositionTable, closed_set
+from budget import SearchBudget, BudgetExceeded
+from moves import generate_moves, safe_autoplay_move
+from deck import CompressedDeck, EMPTY, CARD_RANK, CARD_SUIT, card_name
+
+
+class SearchNode:
+    """
+    One generated state in a ``NodePool``. Only the state key is kept; the
+    state itself lives in the frontier until the node is expanded.
+    """
+    __slots__ = ('key', 'parent', 'move', 'g')
+
+    def __init__(self, key, parent, move, g):
+        self.key = key
+        self.parent = parent  # index of the parent in the pool, None for the root
+        self.move = move  # moves applied to reach this node from its parent
+        self.g = g
+
+
+class NodePool:
+    """
+    Every node generated by one search, in creation order. Nodes refer to
+    their parent by index, so a solution path is read back by following
+    parent indices from the goal.
+    """
 
+    def __init__(self):
+        self.nodes = []
 
-class TreeNode:
-    def __init__(self, state, parent=None):
-        self.state = state
-        self.parent = parent
-        self.children = []
+    def __len__(self):
+        return len(self.nodes)
 
-    def add_child(self, child_node):
-        self.children.append(child_node)
-        child_node.parent = self
+    def __getitem__(self, index):
+        return self.nodes[index]
 
-    def __hash__(self):
-        return hash((tuple(tuple(inner_list) for inner_list in self.state)))
+    def add(self, key, parent, move, g):
+        """
+        Adds a node and returns its index.
+        """
+        self.nodes.append(SearchNode(key, parent, move, g))
+        return len(self.nodes) - 1
+
+    def path_moves(self, index):
+        """
+        Individual moves leading from the root to the node at ``index``.
+        """
+        nodes = self.nodes
+        steps = []
+        while index is not None:
+            node = nodes[index]
+            steps.append(node.move)
+            index = node.parent
+        return [move for applied in reversed(steps) for move in applied]
+
+
+class SolutionPath:
+    """
+    A solution as its start state plus the individual moves from there.
+
+    Positions are only built when asked for: iterating yields each position
+    (the start included) as a CompressedDeck, and ``replay`` plays the moves
+    on a live Deck one at a time.
+    """
+
+    def __init__(self, start, moves):
+        self.start = start.snapshot()
+        self.moves = list(moves)
+
+    def __len__(self):
+        # Positions along the path, the start included
+        return len(self.moves) + 1
+
+    def __iter__(self):
+        state = self.start.snapshot()
+        yield state.snapshot()
+        for move in self.moves:
+            state.apply_move(move)
+            yield state.snapshot()
+
+    def replay(self, deck):
+        """
+        Applies one move to ``deck`` per ``next()`` and yields (deck, move).
+
+        If the board no longer shows the position the next move starts from
+        (the player moved cards in between), it is first replaced by a Deck of
+        that position; the yielded deck is then a new object.
+        """
+        state = self.start.snapshot()
+        for move in self.moves:
+            board = CompressedDeck(deck.piles, deck.card_size, deck.ranks)
+            if (board.tableau, board.free_cells, board.foundations) != (state.tableau, state.free_cells,
+                                                                        state.foundations):
+                deck = state.decompress()
+            deck.apply_move(move)
+            state.apply_move(move)
+            yield deck, move
 
 
 class SearchAlgorithm:
-    def __init__(self):
+    def __init__(self, autoplay=True, budget=None):
         self.tree_nodes = []
+        # Play safe foundation moves as part of each expansion
+        self.autoplay = autoplay
+        # Time, node and memory limits; searches return a BudgetExceeded when they hit one
+        self.budget = budget if budget is not None else SearchBudget()
+        # Nodes generated by the last best-first search or BFS
+        self.node_pool = NodePool()
+        # Budget usage of the last search
+        self.meter = None
 
     def move(self, deck, move):
-        source_pile_index, target_pile_index, selected_cards = move
-
-        source_pile = deck.piles[source_pile_index]
-        target_pile = deck.piles[target_pile_index]
-
-        for card in selected_cards:
-            source_pile.cards.pop()
-            target_pile.cards.append(card)
-
-        deck.piles[source_pile_index] = source_pile
-        deck.piles[target_pile_index] = target_pile
-
-        return deck
+        return deck.apply_move(move)
 
     def child_states(self, board):
         new_states = []
@@ -42,27 +121,161 @@ class SearchAlgorithm:
         return new_states
 
     def win(self, board):
-        foundation_piles = [pile for pile in board.piles if pile.pile_type == "foundation"]
-        for pile in foundation_piles:
-            if len(pile.cards) != 13:
-                return False
-        return True
-
-    def depth(self, node) -> int:
-        depth = 0
-        while node.parent is not None:
-            node = node.parent
-            depth += 1
-        return depth
+        return board.check_for_win()
+
+    def get_valid_moves(self, deck):
+        return generate_moves(deck)
 
     def timed_out(self, before) -> bool:
-        return time() - before > 60
+        return self.budget.time_limit is not None and time() - before > self.budget.time_limit
+
+    def closed_set(self):
+        """
+        A fresh table of reached states, spilling to disk as the budget says.
+        """
+        return closed_set(self.budget.spill_after, self.budget.spill_dir)
+
+    def start_meter(self, start_time=None):
+        self.meter = self.budget.start(start_time)
+        if self.budget.progress:
+            self.meter.heuristic = getattr(self, "heuristic", None)
+        return self.meter
+
+    def solve(self, initial_state):
+        """
+        Searches from the CompressedDeck ``initial_state`` and returns the list
+        of moves to a win, None if there is none, or a BudgetExceeded result.
+        """
+        raise NotImplementedError
+
+    def solution_found(self, score, initial_state, moves, start_time):
+        """
+        Records a solution in the score list: score[0] is the SolutionPath,
+        score[2] the number of moves and score[3] the moves themselves.
+        """
+        score[0] = SolutionPath(initial_state, moves)
+        score[1] = time() - start_time
+        score[2] = len(moves)
+        score[3] = list(moves)
+
+    def budget_exceeded(self, result, score):
+        """
+        Records a search that ran out of budget: no solution in score[0] and
+        the BudgetExceeded (with the best partial state) in score[4].
+        """
+        print(f"Search budget exceeded ({result.reason}) after {result.nodes} nodes, "
+              f"{result.elapsed:.2f} seconds")
+        score[0] = None
+        score[1] = result.elapsed
+        score[4] = result
+
+    def settle(self, state, apply):
+        """
+        Plays safe foundation moves with ``apply`` while autoplay is on and
+        returns them, so they can be undone and replayed one by one.
+        """
+        played = []
+        while self.autoplay:
+            move = safe_autoplay_move(state)
+            if move is None:
+                break
+            apply(move)
+            played.append(move)
+        return played
+
+    def expand(self, state, move, push=False):
+        """
+        Applies ``move`` and the safe foundation moves it uncovers as one search
+        step. Returns the tuple of individual moves applied.
+        """
+        apply = state.push_move if push else state.apply_move
+        apply(move)
+        return (move, *self.settle(state, apply))
+
+    def retract(self, state, applied):
+        for move in reversed(applied):
+            state.undo_move(move)
+
+    def node_moves(self, node):
+        """
+        Individual moves leading from the last search's initial state to ``node``.
+        """
+        return self.node_pool.path_moves(node.parent) + list(node.move)
+
+    def replay(self, initial_state, moves):
+        """
+        Returns the list of states visited by applying ``moves`` from ``initial_state``.
+        """
+        state = initial_state.snapshot()
+        path = [initial_state]
+        for move in moves:
+            state.apply_move(move)
+            path.append(state.snapshot())
+        return path
+
+    def best_first_search(self, initial_state, goal_state_func, operators_func, priority_func, max_g=None,
+                          meter=None, reopen=True):
+        """
+        Expands nodes in order of ``priority_func(state, g)`` using a heap frontier.
+        Returns the goal ``SearchNode`` (see ``node_moves``), None, or a
+        BudgetExceeded result.
+
+        Generated nodes go into ``self.node_pool``; open entries also carry
+        their state, which is dropped once the node is expanded.
+
+        ``operators_func(state)`` returns the moves to try. Each move is applied
+        to the expanded state and undone again; only children that make it into
+        the frontier are copied. A state reached again through a cheaper path
+        replaces its open entry, and is re-opened if it had already been
+        expanded with a larger g. With ``reopen`` False (for priorities that
+        ignore g) a state is only ever queued the first time it is reached.
+
+        Children with g >= ``max_g`` are not generated (they cannot beat a
+        solution of that cost). Expansions are charged to ``meter`` (a fresh
+        one from ``self.budget`` by default); when it runs out the search
+        returns its BudgetExceeded result instead of a node.
+        """
+        if meter is None:
+            meter = self.start_meter()
+        pool = self.node_pool = NodePool()
+        state = initial_state.snapshot()
+        applied = tuple(self.settle(state, state.apply_move))
+        key = state.key()
+        root = pool.add(key, None, applied, 0)
+        frontier = PriorityFrontier()
+        frontier.push((root, state), priority_func(state, 0), key, 0)
+        table = self.closed_set()
+        table.record(key, 0)
+
+        while frontier:
+            (index, state), _, g = frontier.pop()
+
+            if goal_state_func(state):
+                return pool[index]
+
+            meter.offer(state, lambda: pool.path_moves(index))
+            if meter.charge(len(frontier)):
+                return meter.result()
+
+            child_g = g + 1
+            if max_g is not None and child_g >= max_g:
+                continue
+            for move in operators_func(state):
+                applied = self.expand(state, move)
+                key = state.key()
+                if (reopen or table.get(key) is None) and table.record(key, child_g):
+                    child = pool.add(key, index, applied, child_g)
+                    frontier.push((child, state.snapshot()), priority_func(state, child_g), key, child_g)
+                self.retract(state, applied)
+
+        return None
 
 
 class ASTAR(SearchAlgorithm):
-    def __init__(self):
-        super().__init__()
-        self.visited_states = set()
+    def __init__(self, weight=1, autoplay=True, budget=None):
+        super().__init__(autoplay, budget)
+        # f = g + weight * h; weights above 1 trade solution length for speed
+        self.weight = weight
 
     def run(self, board, score):
         start_time = time()
@@ -70,10 +283,8 @@ class ASTAR(SearchAlgorithm):
         # Define the goal state function as a lambda for efficiency
         goal_state_func = lambda deck: deck.check_for_win()
 
-        # Optimized operator function
-        def operators_func(deck):
-            valid_moves = self.get_valid_moves(deck)
-            return [self.move(deck.clone(), move) for move in valid_moves]
+        # Moves are applied in place by the search, children are only copied when queued
+        operators_func = self.get_valid_moves
 
         # Compress the initial state
         compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
@@ -85,125 +296,159 @@ class ASTAR(SearchAlgorithm):
             heuristic_func=self.heuristic
         )
 
+        if isinstance(solution_node, BudgetExceeded):
+            self.budget_exceeded(solution_node, score)
+            return
+
         # If no solution is found
         if solution_node is None:
             score[0] = None
             score[1] = time() - start_time
             return
 
-        # Efficiently construct solution path using a deque
-        solution_path = deque()
-        current_node = solution_node
-
-        while current_node:
-            solution_path.appendleft(current_node.state)
-            current_node = current_node.parent
-
-        # Decompress the solution path
-        decompressed_path = [node.decompress() for node in solution_path]
-
-        # Store the results in score
-        score[0] = decompressed_path
-        score[1] = time() - start_time
-        score[2] = len(decompressed_path) - 1
+        # The path is kept as moves (autoplayed moves included) and replayed on demand
+        self.solution_found(score, compressed_board, self.node_moves(solution_node), start_time)
 
         # Print solution details
         print("Solução encontrada!")
         print("Número de movimentos:", score[2])
         print("Tempo total:", score[1], "segundos")
 
-    def a_star_search(self, initial_state, goal_state_func, operators_func, heuristic_func):
-        root = TreeNode(initial_state)
-        stack = [(root, heuristic_func(initial_state))]
-        filtered_states = set()
-        filtered_states.add(initial_state)
+    def solve(self, initial_state):
+        node = self.a_star_search(initial_state, lambda deck: deck.check_for_win(), self.get_valid_moves,
+                                  self.heuristic)
+        return self.node_moves(node) if isinstance(node, SearchNode) else node
 
-        while len(stack):
-            node, value = stack.pop()
-            self.visited_states.add(node.state)
-            print("Exploring node:", node.state, "Value:", value)
+    def a_star_search(self, initial_state, goal_state_func, operators_func, heuristic_func, max_g=None,
+                      meter=None):
+        weight = self.weight
+        return self.best_first_search(initial_state, goal_state_func, operators_func,
+                                      lambda state, g: g + weight * heuristic_func(state), max_g, meter)
 
-            if goal_state_func(node.state):
-                return node
+    def heuristic(self, deck):
+        h_score = 0
+        empty_columns = 0
+        foundation_counts = deck.foundation_counts()
 
-            children = operators_func(node.state)
-            evaluated_children = [(child, heuristic_func(child) + self.depth(node) + 1) for child in children]
+        h_score -= sum(foundation_counts) * 15
 
-            for child, value in evaluated_children:
-                if child in filtered_states:
-                    continue
+        for column in deck.tableau:
+            if not column:
+                empty_columns += 1
+                continue
 
-                filtered_states.add(child)
-                child_tree = TreeNode(child, node)
-                node.add_child(child_tree)
-                stack.append((child_tree, value))
+            for i, card in enumerate(column):
+                if CARD_RANK[card] == foundation_counts[CARD_SUIT[card]]:
+                    h_score -= 10
+                    h_score += (len(column) - i - 1) * 5
 
-            stack = sorted(stack, key=lambda node: node[1], reverse=True)
+        free_cells_used = len(deck.free_cells) - deck.free_cells.count(EMPTY)
 
-        return None
+        h_score -= empty_columns * 3
+        h_score += free_cells_used * 4
 
-    def heuristic(self, deck):
-        h_score = 0
-        empty_columns = 0
-        free_cells_used = 0
+        return h_score
 
-        for pile in deck.piles:
-            pile_type = pile.pile_type
+class AnytimeASTAR(ASTAR):
+    """
+    ARA*-style anytime search: weighted A* with a large weight finds a first
+    solution quickly, then the search is repeated with smaller weights, each
+    time only looking for paths shorter than the best one so far, until the
+    weights run out or the budget is used up. Every improvement is written to
+    the ``score`` list as soon as it is found.
 
-            if pile_type == "foundation":
-                h_score -= len(pile.cards) * 15
+    ``ASTAR.heuristic`` counts 10-15 points per card, so w = 1 is already
+    strongly greedy with respect to g; the default schedule goes below 1.
+    """
 
-            elif pile_type == "tableau":
-                if not pile.cards:
-                    empty_columns += 1
-                    continue
+    def __init__(self, weights=(1, 0.5, 0.2, 0.1, 0.05, 0.02), autoplay=True, budget=None):
+        super().__init__(weight=weights[0], autoplay=autoplay, budget=budget)
+        self.weights = weights
+        self.improvements = []  # (seconds, number of moves) per published solution
 
-                for i, card in enumerate(pile.cards):
-                    if deck.can_move_to_foundation(card):
-                        h_score -= 10
-                        h_score += len(pile.cards[i + 1:]) * 5
+    def run(self, board, score):
+        print("Starting anytime A*...")
+        start_time = time()
 
-            elif pile_type == "free-cell":
-                if pile.cards:
-                    free_cells_used += 1
+        # Compress the initial state
+        compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
 
-        h_score -= empty_columns * 3
-        h_score += free_cells_used * 4
+        def publish(moves):
+            self.solution_found(score, compressed_board, moves, start_time)
+            self.improvements.append((score[1], score[2]))
+            print(f"Improved solution: {score[2]} moves after {score[1]:.2f} seconds")
 
-        return h_score
+        solution_moves = self.anytime_search(
+            initial_state=compressed_board,
+            goal_state_func=lambda deck: deck.check_for_win(),
+            operators_func=self.get_valid_moves,
+            heuristic_func=self.heuristic,
+            start_time=start_time,
+            publish=publish
+        )
 
-    def get_valid_moves(self, deck):
-        valid_moves = []
+        if isinstance(solution_moves, BudgetExceeded):
+            self.budget_exceeded(solution_moves, score)
+            return
 
-        for x, source_pile in enumerate(deck.piles):
-            if not source_pile.cards or source_pile.pile_type == "foundation":
-                continue
+        if solution_moves is None:
+            print("No solution found within the time limit.")
+            score[0] = None
+            score[1] = time() - start_time
+            return
 
-            # Calculate the maximum number of cards that can be moved
-            empty_tableaus = sum(1 for pile in deck.piles if pile.pile_type == "tableau" and not pile.cards)
-            free_cells = sum(1 for pile in deck.piles if pile.pile_type == "free-cell" and not pile.cards)
-            max_cards_to_move = (empty_tableaus + 1) * (free_cells + 1)
+        print("Solution found!")
+        print("Number of moves:", score[2])
+        print("Total time:", time() - start_time, "seconds")
 
-            for num_cards in range(1, max_cards_to_move + 1):
-                if len(source_pile.cards) < num_cards:
-                    break
+    def solve(self, initial_state):
+        return self.anytime_search(initial_state, lambda deck: deck.check_for_win(), self.get_valid_moves,
+                                   self.heuristic, time())
 
-                selected_cards = source_pile.cards[-num_cards:]
+    def anytime_search(self, initial_state, goal_state_func, operators_func, heuristic_func, start_time,
+                       publish=None):
+        """
+        Returns the shortest list of moves found, or None. Passes are bounded
+        by search depth (autoplayed moves ride along with the move that
+        uncovered them), but a solution is only published if it also has
+        fewer individual moves than the best one so far.
 
-                for y, target_pile in enumerate(deck.piles):
-                    if x == y:
-                        continue
+        All passes share one budget. If it runs out before any solution is
+        found, the BudgetExceeded result is returned instead.
+        """
+        best_moves = None
+        best_depth = None
+        meter = self.start_meter(start_time)
+
+        for weight in self.weights:
+            if meter.check():
+                break
+            self.weight = weight
+            print(f"Weighted A* pass with w = {weight}")
+
+            node = self.a_star_search(initial_state, goal_state_func, operators_func, heuristic_func,
+                                      max_g=best_depth, meter=meter)
+            if isinstance(node, BudgetExceeded):
+                break
+            if node is None:
+                continue
 
-                    if source_pile.valid_transfer(target_pile, selected_cards, deck.ranks):
-                        valid_moves.append((x, y, selected_cards))
+            best_depth = node.g
+            moves = self.node_moves(node)
+            if best_moves is not None and len(moves) >= len(best_moves):
+                continue
+            best_moves = moves
+            if publish is not None:
+                publish(best_moves)
 
-        return valid_moves
+        if best_moves is None and meter.exceeded:
+            return meter.result()
+        return best_moves
 
 
 class BFS(SearchAlgorithm):
-    def __init__(self):
-        super().__init__()
-        self.visited_states = set()
+    def __init__(self, autoplay=True, budget=None):
+        super().__init__(autoplay, budget)
 
     def run(self, board, score):
         print("Starting BFS algorithm...")
@@ -212,130 +457,76 @@ class BFS(SearchAlgorithm):
         # Define the goal state function
         goal_state_func = lambda deck: deck.check_for_win()
 
-        # Define the operators function (generates child states)
-        def operators_func(deck):
-            valid_moves = self.get_valid_moves(deck)
-            child_states = []
-            for move in valid_moves:
-                new_deck = deck.clone()
-                new_deck = self.move(new_deck, move)
-                child_states.append((new_deck, move))
-            return child_states
+        # Moves are applied in place by the search, children are only copied when queued
+        operators_func = self.get_valid_moves
 
         # Compress the initial state
         compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
 
         # Run BFS
-        solution_path = self.bfs_search(
+        solution_moves = self.bfs_search(
             initial_state=compressed_board,
             goal_state_func=goal_state_func,
             operators_func=operators_func
         )
 
-        if not solution_path:
+        if isinstance(solution_moves, BudgetExceeded):
+            self.budget_exceeded(solution_moves, score)
+            return
+
+        if solution_moves is None:
             print("No solution found within the time limit.")
             score[0] = None  # No solution
             score[1] = time() - start_time  # Time taken
             return
 
-        # Decompress the solution path
-        decompressed_path = [node.decompress() for node, _ in solution_path]
-
-        # Store the results in the score list
-        score[0] = decompressed_path  # Solution states
-        score[1] = time() - start_time  # Time taken
-        score[2] = len(decompressed_path) - 1  # Number of moves
-        score[3] = [move for _, move in solution_path[1:]]  # Moves to make
+        self.solution_found(score, compressed_board, solution_moves, start_time)
 
         print("\nSolution found!")
         print(f"Time taken: {score[1]:.2f} seconds")
         print(f"Number of moves: {score[2]}")
         print("\nMoves to make:")
-        for i, move in enumerate(score[3], 1):
-            src = move[0]
-            dest = move[1]
-            card = move[2][0]  # Get the first card in selected_cards
+        for i, (move, state) in enumerate(zip(score[3], score[0]), 1):
+            src, dest, num_cards = move
+            card = card_name(state.pile_cards(src)[-num_cards])  # Bottom card of the moved run
             print(f"{i}. Move {card} from pile {src} to pile {dest}")
 
+    def solve(self, initial_state):
+        return self.bfs_search(initial_state, lambda deck: deck.check_for_win(), self.get_valid_moves)
+
     def bfs_search(self, initial_state, goal_state_func, operators_func):
-        visited = set()
+        meter = self.start_meter()
+        visited = self.closed_set()
         queue = deque()
 
-        # Store (state, move, parent_node) in queue
-        initial_node = (initial_state, None, None)
-        queue.append(initial_node)
-        visited.add(hash(initial_state))
+        # The queue holds (state, node index); moves and depth live in the node pool
+        pool = self.node_pool = NodePool()
+        state = initial_state.snapshot()
+        applied = tuple(self.settle(state, state.apply_move))
+        queue.append((state, pool.add(state.key(), None, applied, 0)))
+        visited.record(state.key(), 0)
 
         while queue:
-            current_state, move, parent_node = queue.popleft()
-            self.visited_states.add(current_state)
+            current_state, index = queue.popleft()
             if goal_state_func(current_state):
-                # Reconstruct path
-                path = []
-                node = (current_state, move, parent_node)
-                while node:
-                    path.append((node[0], node[1]))
-                    node = node[2]
-                path.reverse()
-                return path
-            for new_state, new_move in operators_func(current_state):
-                state_hash = hash(new_state)
-                if state_hash not in visited:
-                    visited.add(state_hash)
-                    new_node = (new_state, new_move, (current_state, move, parent_node))
-                    queue.append(new_node)
+                return pool.path_moves(index)
+
+            meter.offer(current_state, lambda: pool.path_moves(index))
+            if meter.charge(len(queue)):
+                return meter.result()
+            depth = pool[index].g + 1
+            for new_move in operators_func(current_state):
+                new_applied = self.expand(current_state, new_move)
+                key = current_state.key()
+                if visited.record(key, depth):
+                    queue.append((current_state.snapshot(), pool.add(key, index, new_applied, depth)))
+                self.retract(current_state, new_applied)
 
         return None
 
-    def get_valid_moves(self, deck):
-        valid_moves = []
-
-        for x, source_pile in enumerate(deck.piles):
-            if not source_pile.cards or source_pile.pile_type == "foundation":
-                continue
-
-            # Calculate the maximum number of cards that can be moved
-            empty_tableaus = sum(1 for pile in deck.piles if pile.pile_type == "tableau" and not pile.cards)
-            free_cells = sum(1 for pile in deck.piles if pile.pile_type == "free-cell" and not pile.cards)
-            max_cards_to_move = (empty_tableaus + 1) * (free_cells + 1)
-
-            free_move = False
-            free_cell = False
-
-            for num_cards in range(1, max_cards_to_move + 1):
-                if len(source_pile.cards) < num_cards:
-                    break
-
-                selected_cards = source_pile.cards[-num_cards:]
-
-                for y, target_pile in enumerate(deck.piles):
-                    if x == y:
-                        continue
-
-                    if source_pile.valid_transfer(target_pile, selected_cards, deck.ranks):
-                        if target_pile.pile_type == "tableau":
-                            if not target_pile.cards:
-                                if free_move:
-                                    continue
-                                else:
-                                    valid_moves.append((x, y, selected_cards))
-                                    free_move = True
-                            elif not free_move:
-                                valid_moves.append((x, y, selected_cards))
-                        elif target_pile.pile_type == "free-cell":
-                            if free_cell or free_move:
-                                continue
-                            else:
-                                valid_moves.append((x, y, selected_cards))
-                                free_cell = True
-                        elif target_pile.pile_type == "foundation":
-                            valid_moves.append((x, y, selected_cards))
-        return valid_moves
-
 class Greedy(SearchAlgorithm):
-    def __init__(self):
-        super().__init__()
-        self.visited_states = set()
+    def __init__(self, autoplay=True, budget=None):
+        super().__init__(autoplay, budget)
 
     def run(self, board, score):
         start_time = time()
@@ -343,10 +534,8 @@ class Greedy(SearchAlgorithm):
         # Define the goal state function
         goal_state_func = lambda deck: deck.check_for_win()
 
-        # Define the operators function (generates child states)
-        def operators_func(deck):
-            valid_moves = self.get_valid_moves(deck)
-            return [self.move(deck.clone(), move) for move in valid_moves]
+        # Moves are applied in place by the search, children are only copied when queued
+        operators_func = self.get_valid_moves
 
         # Compress the initial state
         compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
@@ -358,102 +547,45 @@ class Greedy(SearchAlgorithm):
             heuristic_func=self.heuristic
         )
 
+        if isinstance(solution_node, BudgetExceeded):
+            self.budget_exceeded(solution_node, score)
+            return
+
         if solution_node is None:
             score[0] = None
             score[1] = time() - start_time
             return
 
-        solution_path = deque()
-        current_node = solution_node
-
-        while current_node:
-            solution_path.appendleft(current_node.state)
-            current_node = current_node.parent
-
-        decompressed_path = [node.decompress() for node in solution_path]
-
-        score[0] = decompressed_path
-        score[1] = time() - start_time
-        score[2] = len(decompressed_path) - 1
+        self.solution_found(score, compressed_board, self.node_moves(solution_node), start_time)
 
         print("Solution found!")
         print("Number of moves:", score[2])
         print("Total time:", score[1], "seconds")
 
-    def greedy_search(self, initial_state, goal_state_func, operators_func, heuristic_func):
-        root = TreeNode(initial_state)
-        stack = [(root, heuristic_func(initial_state))]
-        filtered_states = set()
-        filtered_states.add(initial_state)
-
-        while stack:
-            node, value = stack.pop()
-            print("Exploring node:", node.state, "Value:", value)
-            self.visited_states.add(node.state)
-            if goal_state_func(node.state):
-                return node
-
-            children = operators_func(node.state)
-            evaluated_children = [(child, heuristic_func(child)) for child in children]
-
-            for child, value in evaluated_children:
-                if child in filtered_states:
-                    continue
-
-                filtered_states.add(child)
-                child_tree = TreeNode(child, node)
-                node.add_child(child_tree)
-                stack.append((child_tree, value))
-
-            stack = sorted(stack, key=lambda node: node[1], reverse=True)
+    def solve(self, initial_state):
+        node = self.greedy_search(initial_state, lambda deck: deck.check_for_win(), self.get_valid_moves,
+                                  self.heuristic)
+        return self.node_moves(node) if isinstance(node, SearchNode) else node
 
-        return None
+    def greedy_search(self, initial_state, goal_state_func, operators_func, heuristic_func):
+        # The priority ignores g, so a cheaper path to a known state changes nothing
+        return self.best_first_search(initial_state, goal_state_func, operators_func,
+                                      lambda state, g: heuristic_func(state), reopen=False)
 
     def heuristic(self, deck):
-        h_score = 0
+        h_score = -sum(deck.foundation_counts()) * 10
 
-        for pile in deck.piles:
-            if pile.pile_type == "foundation":
-                h_score -= len(pile.cards) * 10
-            elif pile.pile_type == "tableau":
-                h_score += len(pile.cards)
-                for i in range(len(pile.cards) - 1):
-                    if not deck.is_sequential(pile.cards[i], pile.cards[i + 1]):
-                        h_score += 5
+        for column in deck.tableau:
+            h_score += len(column)
+            for i in range(len(column) - 1):
+                if not deck.is_sequential(column[i], column[i + 1]):
+                    h_score += 5
 
         return h_score
 
-    def get_valid_moves(self, deck):
-        valid_moves = []
-
-        for x, source_pile in enumerate(deck.piles):
-            if not source_pile.cards or source_pile.pile_type == "foundation":
-                continue
-
-            # Calculate the maximum number of cards that can be moved
-            empty_tableaus = sum(1 for pile in deck.piles if pile.pile_type == "tableau" and not pile.cards)
-            free_cells = sum(1 for pile in deck.piles if pile.pile_type == "free-cell" and not pile.cards)
-            max_cards_to_move = (empty_tableaus + 1) * (free_cells + 1)
-
-            for num_cards in range(1, max_cards_to_move + 1):
-                if len(source_pile.cards) < num_cards:
-                    break
-
-                selected_cards = source_pile.cards[-num_cards:]
-
-                for y, target_pile in enumerate(deck.piles):
-                    if x == y:
-                        continue
-
-                    if source_pile.valid_transfer(target_pile, selected_cards, deck.ranks):
-                        valid_moves.append((x, y, selected_cards))
-
-        return valid_moves
-
-
 class DFS(SearchAlgorithm):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, autoplay=True, budget=None):
+        super().__init__(autoplay, budget)
 
     def run(self, board, score):
         print("Starting DFS algorithm...")
@@ -465,154 +597,117 @@ class DFS(SearchAlgorithm):
         print("Initial state compressed, starting search...")
 
         # Run DFS search
-        solution_node = self.dfs_search(
+        solution_moves = self.dfs_moves(
             initial_state=compressed_board,
             max_depth=20  # Reduced depth limit for faster results
         )
 
+        if isinstance(solution_moves, BudgetExceeded):
+            self.budget_exceeded(solution_moves, score)
+            return
+
         # If no solution is found
-        if solution_node is None:
+        if solution_moves is None:
             print("No solution found within the depth limit.")
             score[0] = None
             score[1] = time() - start_time
             return
 
-        print("Solution node found, constructing path...")
-        
-        # Construct solution path
-        solution_path = []
-        current_node = solution_node
-        
-        while current_node:
-            solution_path.insert(0, current_node.state)
-            current_node = current_node.parent
-
-        print(f"Path constructed with {len(solution_path)} states")
-        
-        # Decompress the solution path
-        decompressed_path = [node.decompress() for node in solution_path]
-
-        # Store the results in score
-        score[0] = decompressed_path
-        score[1] = time() - start_time
-        score[2] = len(decompressed_path) - 1
+        self.solution_found(score, compressed_board, solution_moves, start_time)
 
         # Print solution details
         print("Solução encontrada!")
         print("Número de movimentos:", score[2])
         print("Tempo total:", score[1], "segundos")
 
+    def solve(self, initial_state, max_depth=20):
+        return self.dfs_moves(initial_state, max_depth)
+
     def dfs_search(self, initial_state, max_depth=20):
+        """
+        Returns the list of states from ``initial_state`` to a win, None, or a
+        BudgetExceeded result.
+        """
+        moves = self.dfs_moves(initial_state, max_depth)
+        if moves is None or isinstance(moves, BudgetExceeded):
+            return moves
+        return self.replay(initial_state, moves)
+
+    def dfs_moves(self, initial_state, max_depth=20):
         print("Starting DFS search with max depth:", max_depth)
-        root = TreeNode(initial_state)
-        stack = [(root, 0)]  # (node, depth)
-        visited = set()
+        # The whole search walks one mutable state: moves are pushed on the way
+        # down and popped on backtrack, so no state is copied until a goal is found.
+        meter = self.start_meter()
+        state = initial_state.snapshot()
+        self.settle(state, state.push_move)
+        # A state is searched again only if it is reached at a smaller depth
+        visited = self.closed_set()
         visited_count = 0
         
         # Add initial state to visited set
-        visited.add(hash(str(initial_state)))
+        visited.record(state.key(), 0)
         visited_count += 1
         
-        nodes_explored = 0
+        nodes_explored = 1
+        if state.check_for_win():
+            return state.pushed_moves()
+
+        # One iterator of untried moves per level of the current path, and the
+        # number of moves each level pushed (a move plus its autoplayed ones)
+        frames = [iter(self.get_valid_moves(state))]
+        pushed = []
         
-        while stack:
-            node, depth = stack.pop()  # DFS uses stack (LIFO)
+        while frames:
+            move = next(frames[-1], None)
+            if move is None:
+                # Every move at this level was tried: backtrack
+                frames.pop()
+                if pushed:
+                    for _ in range(pushed.pop()):
+                        state.pop_move()
+                continue
+
+            depth = len(frames)
+            applied = self.expand(state, move, push=True)
+
+            if not visited.record(state.key(), depth):
+                for _ in applied:
+                    state.pop_move()
+                continue
+            pushed.append(len(applied))
+
+            visited_count += 1
             nodes_explored += 1
             
             if nodes_explored % 100 == 0:
-                print(f"Explored {nodes_explored} nodes, current depth: {depth}, stack size: {len(stack)}")
+                print(f"Explored {nodes_explored} nodes, current depth: {depth}")
             
             # Check if we've reached the goal state
-            if node.state.check_for_win():
+            if state.check_for_win():
                 print(f"Goal state found at depth {depth} after exploring {nodes_explored} nodes!")
-                return node
+                return state.pushed_moves()
+
+            meter.offer(state, state.pushed_moves)
+            if meter.charge(len(frames)):
+                return meter.result()
                 
             # Don't explore beyond max_depth
             if depth >= max_depth:
+                for _ in range(pushed.pop()):
+                    state.pop_move()
                 continue
                 
-            # Get valid moves and create child states
-            valid_moves = self.get_valid_moves(node.state)
-            print(f"Found {len(valid_moves)} valid moves at depth {depth}")
-            
-            # Process moves in reverse order for better DFS performance
-            for move in reversed(valid_moves):
-                new_state = node.state.clone()
-                self.move(new_state, move)
-                
-                # Create a hash for the state
-                state_hash = hash(str(new_state))
-                
-                if state_hash in visited:
-                    continue
-                    
-                visited.add(state_hash)
-                visited_count += 1
-                
-                child_node = TreeNode(new_state, node)
-                node.add_child(child_node)
-                stack.append((child_node, depth + 1))
-            
-            if depth == 0:
-                print(f"Finished processing root node. Added {len(node.children)} children to stack.")
+            frames.append(iter(self.get_valid_moves(state)))
                 
         print(f"Search complete. Explored {nodes_explored} nodes, visited {visited_count} unique states.")
         return None  # No solution found
 
-    def get_valid_moves(self, deck):
-        valid_moves = []
-
-        for x, source_pile in enumerate(deck.piles):
-            if not source_pile.cards or source_pile.pile_type == "foundation":
-                continue
-
-            # Calculate the maximum number of cards that can be moved
-            empty_tableaus = sum(1 for pile in deck.piles if pile.pile_type == "tableau" and not pile.cards)
-            free_cells = sum(1 for pile in deck.piles if pile.pile_type == "free-cell" and not pile.cards)
-            max_cards_to_move = (empty_tableaus + 1) * (free_cells + 1)
-
-            free_move = False
-            free_cell = False
-
-            for num_cards in range(1, max_cards_to_move + 1):
-                if len(source_pile.cards) < num_cards:
-                    break
-
-                selected_cards = source_pile.cards[-num_cards:]
-
-                for y, target_pile in enumerate(deck.piles):
-                    if x == y:
-                        continue
-
-                    if source_pile.valid_transfer(target_pile, selected_cards, deck.ranks):
-                        if target_pile.pile_type == "tableau":
-                            if not target_pile.cards:
-                                if free_move:
-                                    continue
-                                else:
-                                    valid_moves.append((x, y, selected_cards))
-                                    free_move = True
-                            elif not free_move:
-                                valid_moves.append((x, y, selected_cards))
-                        elif target_pile.pile_type == "free-cell":
-                            if free_cell or free_move:
-                                continue
-                            else:
-                                valid_moves.append((x, y, selected_cards))
-                                free_cell = True
-                        elif target_pile.pile_type == "foundation":
-                            valid_moves.append((x, y, selected_cards))
-        return valid_moves
-
     def apply_move(self, deck, move):
         """
         Applies a move to the deck.
         """
-        source_idx, target_idx, selected_cards = move
-        source_pile = deck.piles[source_idx]
-        target_pile = deck.piles[target_idx]
-
-        source_pile.transfer_cards(selected_cards, target_pile, deck.ranks)
+        if deck.valid_transfer(*move):
+            deck.apply_move(move)
 
     def dfs_heuristic(self, deck):
         """
@@ -621,25 +716,14 @@ class DFS(SearchAlgorithm):
         """
         score = 0
 
-        # Count cards in foundation piles (more is better)
-        foundation_cards = 0
-        for pile in deck.piles:
-            if pile.pile_type == "foundation":
-                foundation_cards += len(pile.cards)
-
         # Reward more cards in foundation (negative because lower is better)
-        score -= foundation_cards * 10
+        score -= sum(deck.foundation_counts()) * 10
 
         # Penalize cards in free cells (they're usually better elsewhere)
-        for pile in deck.piles:
-            if pile.pile_type == "free-cell" and pile.cards:
-                score += 5
+        score += (len(deck.free_cells) - deck.free_cells.count(EMPTY)) * 5
 
         # Reward empty tableau piles (more flexibility)
-        empty_tableaus = 0
-        for pile in deck.piles:
-            if pile.pile_type == "tableau" and not pile.cards:
-                empty_tableaus += 1
+        empty_tableaus = sum(1 for column in deck.tableau if not column)
         score -= empty_tableaus * 8
 
         return score
@@ -648,11 +732,146 @@ class DFS(SearchAlgorithm):
         """
         Converts a deck state to a hashable representation.
         """
-        state_repr = []
+        return deck.key()
 
-        for pile in deck.piles:
-            pile_repr = []
-            for card in pile.cards:
-                pile_repr.append((card.rank, card.suit))
-            state_repr.append(tuple(pile_repr))
-        return tuple(state_repr)
+
+class IDASTAR(SearchAlgorithm):
+    def __init__(self, heuristic=None, autoplay=True, table_size=500000, budget=None):
+        super().__init__(autoplay, budget)
+        # Any function of a state works; defaults to the A* heuristic
+        self.heuristic = heuristic if heuristic is not None else ASTAR().heuristic
+        self.table_size = table_size
+        # Counts of the last search
+        self.nodes_expanded = 0
+        self.iterations = 0
+        self.peak_table_size = 0  # most keys the transposition table held in one iteration
+        self.table = None  # transposition table of the last iteration
+
+    def run(self, board, score):
+        print("Starting IDA* algorithm...")
+        start_time = time()
+
+        # Compress the initial state
+        compressed_board = CompressedDeck(board.piles, board.card_size, board.ranks)
+
+        solution_moves = self.ida_star_search(
+            initial_state=compressed_board,
+            goal_state_func=lambda deck: deck.check_for_win(),
+            heuristic_func=self.heuristic
+        )
+
+        if isinstance(solution_moves, BudgetExceeded):
+            self.budget_exceeded(solution_moves, score)
+            return
+
+        if solution_moves is None:
+            print("No solution found within the time limit.")
+            score[0] = None
+            score[1] = time() - start_time
+            return
+
+        self.solution_found(score, compressed_board, solution_moves, start_time)
+
+        print("Solution found!")
+        print("Number of moves:", score[2])
+        print("Iterations:", self.iterations, "Nodes expanded:", self.nodes_expanded)
+        print("Total time:", score[1], "seconds")
+
+    def solve(self, initial_state):
+        return self.ida_star_search(initial_state, lambda deck: deck.check_for_win(), self.heuristic)
+
+    def ida_star_search(self, initial_state, goal_state_func, heuristic_func):
+        """
+        Repeated depth-first searches bounded by f = g + h, raising the bound to
+        the smallest f that exceeded it. Only the current path is kept in
+        memory, plus a transposition table of at most ``table_size`` keys that
+        is cleared between iterations. Returns the list of moves, None, or a
+        BudgetExceeded result.
+        """
+        self.nodes_expanded = self.iterations = self.peak_table_size = 0
+        meter = self.start_meter()
+        state = initial_state.snapshot()
+        self.settle(state, state.push_move)
+        if goal_state_func(state):
+            return state.pushed_moves()
+
+        bound = heuristic_func(state)
+        while True:
+            self.iterations += 1
+            print(f"IDA* iteration {self.iterations}, bound {bound}, nodes expanded {self.nodes_expanded}")
+            found, next_bound = self.bounded_search(state, bound, goal_state_func, heuristic_func, meter)
+            self.peak_table_size = max(self.peak_table_size, len(self.table))
+            if found:
+                return state.pushed_moves()
+            if meter.exceeded:
+                return meter.result()
+            if next_bound is None:
+                return None
+            bound = next_bound
+
+    def bounded_search(self, state, bound, goal_state_func, heuristic_func, meter):
+        """
+        One IDA* iteration on ``state``, pushing and popping moves in place.
+
+        Returns (True, None) with the solution left pushed on ``state``, or
+        (False, next_bound) where next_bound is None if nothing was cut off
+        (or ``meter`` ran out).
+        """
+        table = self.table = TranspositionTable(self.table_size)
+        table.record(state.key(), 0)
+        next_bound = None
+
+        frames = [iter(self.ordered_moves(state, heuristic_func))]
+        pushed = []
+
+        while frames:
+            move = next(frames[-1], None)
+            if move is None:
+                frames.pop()
+                if pushed:
+                    for _ in range(pushed.pop()):
+                        state.pop_move()
+                continue
+
+            g = len(frames)
+            applied = self.expand(state, move, push=True)
+
+            if table.record(state.key(), g):
+                if goal_state_func(state):
+                    return True, None
+
+                f = g + heuristic_func(state)
+                if f <= bound:
+                    self.nodes_expanded += 1
+                    meter.offer(state, state.pushed_moves)
+                    if meter.charge(len(frames)):
+                        for _ in applied:
+                            state.pop_move()
+                        while pushed:
+                            for _ in range(pushed.pop()):
+                                state.pop_move()
+                        return False, None
+
+                    pushed.append(len(applied))
+                    frames.append(iter(self.ordered_moves(state, heuristic_func)))
+                    continue
+
+                if next_bound is None or f < next_bound:
+                    next_bound = f
+
+            for _ in applied:
+                state.pop_move()
+
+        return False, next_bound
+
+    def ordered_moves(self, state, heuristic_func):
+        """
+        Valid moves sorted so the most promising child (lowest h) is tried first.
+        """
+        scored = []
+        for move in self.get_valid_moves(state):
+            applied = self.expand(state, move)
+            scored.append((heuristic_func(state), len(scored), move))
+            self.retract(state, applied)
+        scored.sort()
+        return [move for _, _, move in scored]
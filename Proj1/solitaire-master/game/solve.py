@@ -0,0 +1,198 @@
+"""
+Headless batch solver.
+
+Solves every state file matched by the given paths (directories, files or
+glob patterns) in parallel and writes one result per deal as JSON lines or
+CSV (picked from the output file extension). Deal archives (.deals, see
+dealfile.py) contribute one deal per record:
+
+    python solve.py states/ --algorithm astar --time-limit 30 --jobs 4 --output results.jsonl
+
+Each deal is solved in a fresh worker process, so ``peak_memory`` is that
+deal's own peak resident memory (interpreter included). ``--trace-memory``
+also reports the peak Python allocation of the search (``traced_memory``),
+measured by running it a second time under tracemalloc after the timed run.
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from time import time
+from budget import SearchBudget, BudgetExceeded, peak_resident_memory
+from dealfile import ARCHIVE_EXTENSION, archive_entries, is_archive, load_state
+from external_bfs import ExternalBFS
+from searchAlgorithms import ASTAR, AnytimeASTAR, BFS, DFS, Greedy, IDASTAR
+
+FIELDS = ["file", "algorithm", "solved", "moves", "nodes", "time", "peak_memory", "traced_memory", "reason"]
+
+ALGORITHMS = {
+    "astar": lambda weight, budget: ASTAR(weight=weight, budget=budget),
+    "anytime": lambda weight, budget: AnytimeASTAR(budget=budget),
+    "bfs": lambda weight, budget: BFS(budget=budget),
+    "bfs-external": lambda weight, budget: ExternalBFS(budget=budget),
+    "dfs": lambda weight, budget: DFS(budget=budget),
+    "greedy": lambda weight, budget: Greedy(budget=budget),
+    "idastar": lambda weight, budget: IDASTAR(budget=budget),
+}
+
+
+def find_deals(paths):
+    """
+    Expands directories (every .txt and .deals inside) and glob patterns into
+    a sorted list of state files. Archives are replaced by their deals
+    (``archive#index``, see ``dealfile.load_state``).
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, "*.txt")))
+            files.update(glob.glob(os.path.join(path, "*" + ARCHIVE_EXTENSION)))
+        else:
+            files.update(glob.glob(path, recursive=True))
+
+    deals = []
+    for file_path in sorted(files):
+        if is_archive(file_path):
+            deals.extend(archive_entries(file_path))
+        else:
+            deals.append(file_path)
+    return deals
+
+
+def solve_deal(file_path, algorithm, weight, budget, trace_memory=False):
+    """
+    Solves one state file and returns its result row. The solvers' progress
+    output is discarded.
+
+    ``peak_memory`` is the peak resident memory of the process, so it only
+    describes this deal when the process solves nothing else (see
+    ``solve_all``).
+    """
+    solver = ALGORITHMS[algorithm](weight, budget)
+    initial_state = load_state(file_path)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start_time = time()
+        result = solver.solve(initial_state)
+        elapsed = time() - start_time
+        peak = peak_resident_memory()
+        nodes = solver.meter.nodes if solver.meter is not None else None
+        traced = traced_peak(file_path, algorithm, weight, budget, nodes) if trace_memory else None
+
+    return {
+        "file": file_path,
+        "algorithm": algorithm,
+        "solved": isinstance(result, list),
+        "moves": len(result) if isinstance(result, list) else None,
+        "nodes": nodes,
+        "time": round(elapsed, 4),
+        "peak_memory": peak,
+        "traced_memory": traced,
+        "reason": result.reason if isinstance(result, BudgetExceeded) else None,
+    }
+
+
+def traced_peak(file_path, algorithm, weight, budget, nodes):
+    """
+    Peak memory allocated by the search as seen by tracemalloc. Tracing makes
+    the search several times slower, so it is run again without time or
+    memory limits and stopped after the ``nodes`` expansions the timed run
+    made.
+    """
+    budget = copy(budget)
+    budget.time_limit = budget.max_memory = None
+    if nodes is not None:
+        budget.max_nodes = nodes + 1
+    solver = ALGORITHMS[algorithm](weight, budget)
+    initial_state = load_state(file_path)
+
+    tracemalloc.start()
+    try:
+        solver.solve(initial_state)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def solve_all(files, algorithm, weight, budget, jobs, trace_memory=False):
+    """
+    Yields result rows in the order the deals finish. Every deal gets a worker
+    process of its own (also with one job), so each row's peak memory is
+    that deal's alone.
+    """
+    with ProcessPoolExecutor(jobs, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(solve_deal, file_path, algorithm, weight, budget, trace_memory)
+                   for file_path in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_results(rows, output):
+    """
+    Writes rows as CSV if ``output`` ends in .csv, JSON lines otherwise.
+    Rows are flushed as they arrive so an interrupted run keeps its results.
+    Returns the number of rows written.
+    """
+    written = 0
+    if output is None:
+        stream = sys.stdout
+    else:
+        stream = open(output, "w", newline="")
+    try:
+        writer = None
+        if output is not None and output.endswith(".csv"):
+            writer = csv.DictWriter(stream, fieldnames=FIELDS)
+            writer.writeheader()
+        for row in rows:
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps(row) + "\n")
+            stream.flush()
+            written += 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve FreeCell state files without the GUI.")
+    parser.add_argument("paths", nargs="+", help="state files, directories or glob patterns")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="astar")
+    parser.add_argument("--weight", type=float, default=1, help="heuristic weight for astar")
+    parser.add_argument("--time-limit", type=float, default=60, help="seconds per deal")
+    parser.add_argument("--max-nodes", type=int, default=None, help="expanded nodes per deal")
+    parser.add_argument("--max-memory", type=int, default=None, help="resident memory per worker, in MB")
+    parser.add_argument("--spill-after", type=int, default=None,
+                        help="states kept in memory before the closed set moves to a memory-mapped file")
+    parser.add_argument("--spill-dir", default=None, help="directory for spilled closed sets")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="deals solved in parallel")
+    parser.add_argument("--output", default=None, help="results file (.jsonl or .csv), stdout by default")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also report the search's peak Python allocations (runs each search twice)")
+    args = parser.parse_args(argv)
+
+    files = find_deals(args.paths)
+    if not files:
+        parser.error("no state files found")
+
+    max_memory = args.max_memory * 1024 * 1024 if args.max_memory is not None else None
+    budget = SearchBudget(time_limit=args.time_limit, max_nodes=args.max_nodes, max_memory=max_memory,
+                          spill_after=args.spill_after, spill_dir=args.spill_dir)
+    jobs = max(1, min(args.jobs, len(files)))
+
+    written = write_results(solve_all(files, args.algorithm, args.weight, budget, jobs, args.trace_memory),
+                            args.output)
+    print(f"Wrote {written} results for {args.algorithm}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import threading
+from copy import copy
+from time import time
+
+
+class SolveResult(list):
+    """
+    What a solver's ``run`` fills in. It is still the six-slot score list the
+    solvers write to (``run(board, result)``), with a name for each slot.
+    """
+
+    def __init__(self):
+        super().__init__([None] * 6)
+
+    @property
+    def path(self):
+        """The SolutionPath from the initial state to the win, or None."""
+        return self[0]
+
+    @property
+    def elapsed(self):
+        return self[1]
+
+    @property
+    def num_moves(self):
+        return self[2]
+
+    @property
+    def moves(self):
+        """The individual (source, target, num_cards) moves of the solution."""
+        return self[3]
+
+    @property
+    def exceeded(self):
+        """The BudgetExceeded result if the search ran out of budget or was cancelled."""
+        return self[4]
+
+    @property
+    def solver_name(self):
+        """Winning solver of a portfolio run."""
+        return self[5]
+
+    @property
+    def solved(self):
+        return self.path is not None
+
+
+class SolverTask:
+    """
+    Runs ``solver.run`` on a copy of a Deck in a background thread, so the
+    game loop keeps drawing and handling events while it searches.
+
+    Works like a future: ``done()``, ``cancel()`` and ``result()``. While it
+    runs, ``progress()`` reads the solver's budget meter (nodes expanded,
+    frontier size, best heuristic value so far). Cancelling sets the budget's
+    cancel event, so the search stops within ``check_every`` expansions and
+    the result records a "cancelled" BudgetExceeded.
+    """
+
+    def __init__(self, name, solver, deck):
+        self.name = name
+        self.solver = solver
+        self.cancel_event = threading.Event()
+        budget = copy(solver.budget)
+        budget.cancel = self.cancel_event
+        budget.progress = True
+        solver.budget = budget
+
+        self.board = deck.clone()
+        self.start_time = None
+        self.error = None
+        self._result = SolveResult()
+        self.thread = threading.Thread(target=self._run, name=f"solver-{name}", daemon=True)
+
+    def _run(self):
+        try:
+            self.solver.run(self.board, self._result)
+        except Exception as error:
+            self.error = error
+
+    def start(self):
+        self.start_time = time()
+        self.thread.start()
+        return self
+
+    def done(self):
+        return self.start_time is not None and not self.thread.is_alive()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Waits for the search and returns its SolveResult. Re-raises anything
+        the solver raised.
+        """
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            raise TimeoutError(f"{self.name} is still searching")
+        if self.error is not None:
+            raise self.error
+        return self._result
+
+    def progress(self):
+        """
+        Snapshot of the running search: nodes, frontier, best_h (None when the
+        solver has no heuristic) and elapsed seconds.
+        """
+        meter = self.solver.meter
+        elapsed = time() - self.start_time if self.start_time is not None else 0.0
+        if meter is None:
+            return {"nodes": 0, "frontier": 0, "best_h": None, "elapsed": elapsed}
+        return {"nodes": meter.nodes, "frontier": meter.frontier, "best_h": meter.best_h, "elapsed": elapsed}
+
+    def describe(self):
+        """
+        One-line progress text for the game screen.
+        """
+        progress = self.progress()
+        best_h = "-" if progress["best_h"] is None else progress["best_h"]
+        return (f"{self.name}: {progress['nodes']:,} nodes, frontier {progress['frontier']:,}, "
+                f"best h {best_h}, {progress['elapsed']:.1f}s")
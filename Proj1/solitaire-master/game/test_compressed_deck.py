@@ -0,0 +1,76 @@
+import unittest
+from card import Card
+from pile import Pile
+from deck import CompressedDeck, EMPTY
+
+
+def make_card(name):
+    rank, suit = name.split('_of_')
+    return Card(f"resources/cards/{name}.png", (100, 150), rank, suit)
+
+
+def make_state(tableaus, free_cells=(), foundations=((), (), (), ())):
+    piles = [Pile([make_card(c) for c in cards], 0, 0, (100, 150)) for cards in tableaus]
+    piles += [Pile([make_card(c) for c in cards], 0, 0, (100, 150), pile_type="free-cell") for cards in free_cells]
+    piles += [Pile([make_card(c) for c in cards], 0, 0, (100, 150), pile_type="foundation") for cards in foundations]
+    return CompressedDeck(piles, (100, 150))
+
+
+class TestCompressedDeck(unittest.TestCase):
+    def test_round_trip_encoding(self):
+        state = make_state([["king_of_spades", "queen_of_hearts"], []], free_cells=[["2_of_clubs"], []],
+                           foundations=[["ace_of_clubs"], [], [], []])
+
+        self.assertEqual(state.pile_cards(0), bytes([51, 37]))
+        self.assertEqual(list(state.free_cells), [1, EMPTY])
+        self.assertEqual(state.foundation_counts(), [1, 0, 0, 0])
+        self.assertEqual(state.pile_size(4), 1)
+
+    def test_key_ignores_column_and_free_cell_order(self):
+        a = make_state([["king_of_spades", "queen_of_hearts"], ["5_of_clubs"]],
+                       free_cells=[["2_of_clubs"], []])
+        b = make_state([["5_of_clubs"], ["king_of_spades", "queen_of_hearts"]],
+                       free_cells=[[], ["2_of_clubs"]])
+
+        self.assertEqual(a.key(), b.key())
+        self.assertEqual(a, b)
+
+    def test_key_tells_apart_which_cards_share_a_column(self):
+        a = make_state([["king_of_spades", "queen_of_hearts"], ["king_of_clubs", "queen_of_diamonds"]])
+        b = make_state([["king_of_spades", "queen_of_diamonds"], ["king_of_clubs", "queen_of_hearts"]])
+
+        self.assertNotEqual(a.key(), b.key())
+
+    def test_incremental_key_matches_full_computation(self):
+        state = make_state([["king_of_spades", "queen_of_hearts", "ace_of_clubs"], []],
+                           free_cells=[[], []])
+        moves = [(0, 4, 1), (0, 1, 2), (1, 2, 1), (2, 1, 1)]
+
+        for move in moves:
+            self.assertTrue(state.valid_transfer(*move), move)
+            state.apply_move(move)
+            self.assertEqual(state.key(), state.compute_key())
+
+        self.assertEqual(state.pile_cards(1), bytes([51, 37]))
+        self.assertEqual(state.foundation_counts(), [1, 0, 0, 0])
+
+    def test_push_and_pop_restore_the_state(self):
+        state = make_state([["king_of_spades", "queen_of_hearts", "ace_of_clubs"], []],
+                           free_cells=[[], []])
+        before = (list(state.tableau), bytes(state.free_cells), bytes(state.foundations), state.key())
+
+        for move in [(0, 4, 1), (0, 1, 2), (1, 2, 1)]:
+            state.push_move(move)
+        self.assertEqual(state.pushed_moves(), [(0, 4, 1), (0, 1, 2), (1, 2, 1)])
+
+        snapshot = state.snapshot()
+        while state.pushed_moves():
+            state.pop_move()
+
+        self.assertEqual((list(state.tableau), bytes(state.free_cells), bytes(state.foundations), state.key()),
+                         before)
+        self.assertEqual(snapshot.pile_cards(2), bytes([37]))
+
+
+if __name__ == "__main__":
+    unittest.main()
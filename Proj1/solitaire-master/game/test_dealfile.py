@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from deck import CompressedDeck
+from dealfile import (DealArchive, RECORD_SIZE, HEADER, decode_state, encode_state, load_state, main,
+                      write_archive)
+from solve import find_deals
+
+DEALS = ["states/deck2.txt", "states/deck9.txt", "states/deck11.txt"]
+
+
+def position(state):
+    return state.tableau, state.free_cells, state.foundations
+
+
+class TestDealFile(unittest.TestCase):
+    def test_record_round_trip(self):
+        state = CompressedDeck.load_from_file("states/deck9.txt")
+        record = encode_state(state)
+
+        self.assertEqual(len(record), RECORD_SIZE)
+        decoded = decode_state(record)
+        self.assertEqual(position(decoded), position(state))
+        self.assertEqual(decoded.key(), state.key())
+
+    def test_archive_is_mapped_and_indexed(self):
+        states = [CompressedDeck.load_from_file(path) for path in DEALS]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.deals")
+            self.assertEqual(write_archive(path, iter(states)), 3)
+            self.assertEqual(os.path.getsize(path), HEADER.size + 3 * RECORD_SIZE)
+
+            with DealArchive(path) as archive:
+                self.assertEqual(len(archive), 3)
+                self.assertEqual([position(state) for state in archive], [position(state) for state in states])
+                self.assertEqual(position(archive[-1]), position(states[-1]))
+
+            self.assertEqual(find_deals([directory]), [f"{path}#{index}" for index in range(3)])
+            self.assertEqual(position(load_state(f"{path}#1")), position(states[1]))
+
+    def test_pack_and_unpack_text_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.deals")
+            main(["pack", *DEALS, "--output", path])
+            main(["unpack", path, "--output", os.path.join(directory, "unpacked")])
+
+            for index, original in enumerate(sorted(DEALS)):
+                unpacked = CompressedDeck.load_from_file(os.path.join(directory, "unpacked", f"deck{index}.txt"))
+                self.assertEqual(position(unpacked), position(CompressedDeck.load_from_file(original)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from deck import Deck
+from deck import CompressedDeck
 from card import Card
 from pile import Pile
 from searchAlgorithms import DFS
@@ -22,7 +22,8 @@ class TestDFS(unittest.TestCase):
         free_cell = Pile([self.ace_spades], 300, 0, (100, 150), pile_type="free-cell")
         
         # Create the deck
-        self.deck = Deck(piles=[tableau1, tableau2, foundation, free_cell])
+        piles = [tableau1, tableau2, foundation, free_cell]
+        self.deck = CompressedDeck(piles, (100, 150))
         
         # Create the DFS solver
         self.dfs = DFS()
@@ -36,13 +37,9 @@ class TestDFS(unittest.TestCase):
         
         # Create a better state (ace in foundation)
         better_deck = self.deck.clone()
-        foundation_pile = better_deck.piles[2]
-        free_cell_pile = better_deck.piles[3]
-        
+
         # Move ace to foundation
-        ace = free_cell_pile.cards[0]
-        free_cell_pile.cards = []
-        foundation_pile.cards = [ace]
+        better_deck.apply_move((3, 2, 1))
         
         better_score = self.dfs.dfs_heuristic(better_deck)
         
@@ -62,7 +59,7 @@ class TestDFS(unittest.TestCase):
             self.assertEqual(len(move), 3)
             self.assertIsInstance(move[0], int)  # source pile index
             self.assertIsInstance(move[1], int)  # target pile index
-            self.assertIsInstance(move[2], list)  # selected cards
+            self.assertIsInstance(move[2], int)  # number of cards moved
     
     def test_apply_move(self):
         """
@@ -92,7 +89,7 @@ class TestDFS(unittest.TestCase):
         foundation = Pile([], 100, 0, (100, 150), pile_type="foundation")
         free_cell = Pile([ace_spades], 200, 0, (100, 150), pile_type="free-cell")
         
-        simple_deck = Deck(piles=[tableau, foundation, free_cell])
+        simple_deck = CompressedDeck([tableau, foundation, free_cell], (100, 150))
         
         # Run DFS search
         solution = self.dfs.dfs_search(simple_deck, max_depth=5)
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from budget import SearchBudget, BudgetExceeded
+from deck import CompressedDeck
+from external_bfs import ExternalBFS
+from searchAlgorithms import BFS
+from test_searches import SolutionChecks
+
+
+class TestExternalBFS(SolutionChecks, unittest.TestCase):
+    def setUp(self):
+        self.state = CompressedDeck.load_from_file("states/deck2.txt")
+
+    def test_solves_like_bfs_with_layers_on_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            solver = ExternalBFS(run_size=7, directory=directory)
+            moves = solver.solve(self.state)
+            self.assertEqual(os.listdir(directory), [])
+
+        state = self.assert_valid_moves(self.state, moves)
+        self.assertTrue(state.check_for_win())
+
+        # Same depth as the in-memory BFS: the goal is generated from the last layer
+        in_memory = BFS()
+        in_memory.solve(self.state)
+        goal_depth = min(node.g for node in in_memory.node_pool.nodes if node.key == state.key())
+        self.assertEqual(len(solver.layer_sizes), goal_depth)
+
+    def test_budget_keeps_the_best_partial_path(self):
+        result = ExternalBFS(budget=SearchBudget(max_nodes=5)).solve(
+            CompressedDeck.load_from_file("states/deck11.txt"))
+
+        self.assertIsInstance(result, BudgetExceeded)
+        state = self.assert_valid_moves(CompressedDeck.load_from_file("states/deck11.txt"), result.moves)
+        self.assertEqual(state.key(), result.state.key())
+
+
+if __name__ == "__main__":
+    unittest.main()
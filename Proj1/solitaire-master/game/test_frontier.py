@@ -0,0 +1,35 @@
+import unittest
+from frontier import PriorityFrontier
+
+
+class TestPriorityFrontier(unittest.TestCase):
+    def test_pops_lowest_priority_first(self):
+        frontier = PriorityFrontier()
+        for item, priority in [("b", 5), ("a", 1), ("c", 9)]:
+            frontier.push(item, priority, key=item)
+
+        popped = [frontier.pop()[0] for _ in range(3)]
+        self.assertEqual(popped, ["a", "b", "c"])
+        self.assertFalse(frontier)
+
+    def test_ties_prefer_latest_push(self):
+        frontier = PriorityFrontier()
+        frontier.push("first", 3, key=1)
+        frontier.push("second", 3, key=2)
+
+        self.assertEqual(frontier.pop()[0], "second")
+
+    def test_cheaper_path_replaces_open_entry(self):
+        frontier = PriorityFrontier()
+        self.assertTrue(frontier.push("deep", 10, key="state", g=8))
+        self.assertFalse(frontier.push("deeper", 12, key="state", g=9))
+        self.assertTrue(frontier.push("shallow", 4, key="state", g=2))
+
+        self.assertEqual(len(frontier), 1)
+        self.assertEqual(frontier.pop(), ("shallow", 4, 2))
+        with self.assertRaises(IndexError):
+            frontier.pop()
+
+
+if __name__ == "__main__":
+    unittest.main()
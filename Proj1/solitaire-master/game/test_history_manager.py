@@ -0,0 +1,56 @@
+import random
+import unittest
+from deck import Deck, CompressedDeck
+from history_manager import HistoryManager
+from moves import generate_moves
+
+
+def compress(deck):
+    return CompressedDeck(deck.piles, deck.card_size, deck.ranks)
+
+
+class TestHistoryManager(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck.load_deck_from_file("states/deck9.txt")
+        self.history = HistoryManager(self.deck, checkpoint_every=4)
+        self.positions = [compress(self.deck).tableau]
+
+    def play(self, count, seed=0):
+        rng = random.Random(seed)
+        for _ in range(count):
+            move = rng.choice(list(generate_moves(compress(self.deck))))
+            self.deck.apply_move(move)
+            self.history.valid_move_made(move)
+            self.positions.append(compress(self.deck).tableau)
+
+    def test_undo_and_redo_walk_the_game(self):
+        self.play(10)
+
+        for position in reversed(range(10)):
+            self.history.undo(self.deck)
+            self.assertEqual(compress(self.deck).tableau, self.positions[position])
+        self.assertFalse(self.history.can_undo())
+        self.history.undo(self.deck)
+        self.assertEqual(compress(self.deck).tableau, self.positions[0])
+
+        for position in range(1, 11):
+            self.history.redo(self.deck)
+            self.assertEqual(compress(self.deck).tableau, self.positions[position])
+        self.assertFalse(self.history.can_redo())
+
+    def test_new_move_drops_the_undone_ones(self):
+        self.play(10)
+        for _ in range(5):
+            self.history.undo(self.deck)
+        del self.positions[6:]
+        self.play(3, seed=1)
+
+        self.assertEqual(len(self.history), 8)
+        self.assertFalse(self.history.can_redo())
+        self.assertEqual(len(self.history.checkpoints), 3)
+        for position in range(9):
+            self.assertEqual(self.history.state_at(position).tableau, self.positions[position])
+
+
+if __name__ == "__main__":
+    unittest.main()
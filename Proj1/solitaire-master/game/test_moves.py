@@ -0,0 +1,97 @@
+import random
+import unittest
+from card import Card
+from pile import Pile
+from deck import Deck, CompressedDeck
+from moves import generate_moves, movable_run_length, is_safe_autoplay, safe_autoplay_move, supermove_capacity
+
+
+def brute_force_child_keys(state):
+    """
+    Canonical keys reachable by trying every (source, target, num_cards) with valid_transfer.
+    """
+    pile_types = state.layout.pile_types
+    empty_tableaus = sum(1 for column in state.tableau if not column)
+    free_cells = sum(1 for i in range(len(pile_types)) if pile_types[i] == "free-cell" and not state.pile_size(i))
+
+    keys = set()
+    for source in range(len(pile_types)):
+        if pile_types[source] == "foundation":
+            continue
+        for target in range(len(pile_types)):
+            to_empty = pile_types[target] == "tableau" and not state.pile_size(target)
+            capacity = supermove_capacity(free_cells, empty_tableaus, to_empty)
+            lengths = [n for n in range(1, min(state.pile_size(source), capacity) + 1)
+                       if target != source and state.valid_transfer(source, target, n)]
+            if to_empty and pile_types[source] == "tableau":
+                lengths = [n for n in lengths if n < state.pile_size(source)]
+            for num_cards in lengths:
+                keys.add(state.clone().apply_move((source, target, num_cards)).key())
+    keys.discard(state.key())
+    return keys
+
+
+class TestGenerateMoves(unittest.TestCase):
+    def test_run_length(self):
+        # king of clubs, then a 9 of clubs, 8 of hearts, 7 of spades run
+        self.assertEqual(movable_run_length(bytes([12, 8, 33, 45])), 3)
+        self.assertEqual(movable_run_length(bytes([33, 8])), 1)
+        self.assertEqual(movable_run_length(b''), 0)
+
+    def test_supermove_capacity(self):
+        self.assertEqual(supermove_capacity(0, 0), 1)
+        self.assertEqual(supermove_capacity(2, 0), 3)
+        self.assertEqual(supermove_capacity(2, 2), 12)
+        self.assertEqual(supermove_capacity(2, 2, to_empty_column=True), 6)
+        self.assertEqual(supermove_capacity(4, 1, to_empty_column=True), 5)
+
+    def test_matches_brute_force_on_random_positions(self):
+        deck = Deck.load_deck_from_file("states/deck11.txt")
+        rng = random.Random(7)
+
+        for _ in range(20):
+            state = CompressedDeck(deck.piles, deck.card_size, deck.ranks)
+            for _ in range(40):
+                moves = generate_moves(state)
+                for move in moves:
+                    self.assertTrue(state.valid_transfer(*move), move)
+
+                child_keys = {state.clone().apply_move(move).key() for move in moves}
+                self.assertEqual(child_keys, brute_force_child_keys(state))
+
+                if not moves:
+                    break
+                state.apply_move(rng.choice(moves))
+
+
+class TestSafeAutoplay(unittest.TestCase):
+    def test_aces_and_twos_are_always_safe(self):
+        counts = [1, 0, 0, 0]  # ace of clubs home
+        self.assertTrue(is_safe_autoplay(13, counts))  # ace of diamonds
+        self.assertTrue(is_safe_autoplay(1, counts))  # 2 of clubs
+        self.assertFalse(is_safe_autoplay(2, counts))  # 3 of clubs is not next
+
+    def test_needs_both_opposite_colour_cards_home(self):
+        # 3 of hearts is next; the 2 of clubs is home but the 2 of spades is not
+        self.assertFalse(is_safe_autoplay(28, [2, 0, 2, 1]))
+        self.assertTrue(is_safe_autoplay(28, [2, 0, 2, 2]))
+
+    def test_safe_move_targets_the_suit_foundation(self):
+        def pile(names, pile_type):
+            cards = [Card(f"resources/cards/{n}.png", (100, 150), *n.split('_of_')) for n in names]
+            return Pile(cards, 0, 0, (100, 150), pile_type=pile_type)
+
+        state = CompressedDeck([pile(["king_of_spades", "3_of_hearts"], "tableau"),
+                                pile([], "free-cell"),
+                                pile(["ace_of_clubs", "2_of_clubs"], "foundation"),
+                                pile(["ace_of_hearts", "2_of_hearts"], "foundation"),
+                                pile(["ace_of_spades", "2_of_spades"], "foundation"),
+                                pile([], "foundation")], (100, 150))
+
+        self.assertEqual(safe_autoplay_move(state), (0, 3, 1))
+        state.apply_move((0, 3, 1))
+        self.assertIsNone(safe_autoplay_move(state))
+
+
+if __name__ == "__main__":
+    unittest.main()
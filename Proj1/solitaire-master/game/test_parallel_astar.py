@@ -0,0 +1,95 @@
+import os
+import queue
+import unittest
+from unittest import mock
+from deck import CompressedDeck
+from parallel_astar import HDASTAR, WorkerLost
+from budget import SearchBudget, BudgetExceeded
+from test_searches import SolutionChecks
+
+
+def crash(*args):
+    os._exit(3)
+
+
+class TestHDASTAR(SolutionChecks, unittest.TestCase):
+    def test_solves_deal_across_workers(self):
+        initial_state = CompressedDeck.load_from_file("states/deck9.txt")
+        hda = HDASTAR(workers=3)
+
+        moves = hda.solve(initial_state)
+
+        self.assert_solves(initial_state, moves)
+        self.assertEqual(len(hda.worker_stats), 3)
+        self.assertTrue(all(stats["expansions"] > 0 for stats in hda.worker_stats))
+
+    def test_node_budget_is_split_between_workers(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        hda = HDASTAR(workers=2, budget=SearchBudget(max_nodes=100))
+
+        result = hda.solve(initial_state)
+
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertEqual(result.reason, "nodes")
+        self.assertLessEqual(result.nodes, 100)
+        self.assertEqual(self.assert_valid_moves(initial_state, result.moves), result.state)
+
+    def wait_for_outcome(self, messages, workers=3):
+        results, inboxes = queue.Queue(), [queue.Queue() for _ in range(workers)]
+        for message in messages:
+            results.put(message)
+        outcome = HDASTAR(workers=workers, budget=SearchBudget(time_limit=None))._wait_for_outcome(
+            results, inboxes, [], 0)
+        return outcome, [[inbox.get_nowait() for _ in range(inbox.qsize())] for inbox in inboxes]
+
+    def test_outdated_idle_reports_do_not_end_search(self):
+        # A reports idle, takes a batch from B and passes one on to C; the
+        # counts balance, but A's report is stale and its probe reply says so
+        messages = [("idle", 0, 2, 1), ("idle", 1, 1, 2), ("idle", 2, 0, 1),
+                    ("status", 1, 0, False, 3, 2), ("status", 1, 1, True, 1, 2), ("status", 1, 2, True, 0, 1),
+                    ("goal", (0, 7))]
+
+        outcome, probes = self.wait_for_outcome(messages)
+
+        self.assertEqual(outcome, ((0, 7), None))
+        self.assertEqual(probes, [[("probe", 1)]] * 3)
+
+    def test_busy_withdraws_idle_report(self):
+        messages = [("idle", 0, 1, 1), ("idle", 1, 1, 1), ("busy", 0), ("idle", 2, 0, 1), ("goal", (1, 0))]
+
+        outcome, probes = self.wait_for_outcome(messages)
+
+        self.assertEqual(outcome, ((1, 0), None))
+        self.assertEqual(probes, [[], [], []])
+
+    def test_exhausted_after_two_matching_probe_waves(self):
+        idle = [("status", wave, worker, True, sent, received)
+                for wave in (1, 2) for worker, sent, received in ((0, 2, 1), (1, 1, 2), (2, 0, 1))]
+        messages = [("idle", 0, 2, 1), ("idle", 1, 1, 2), ("idle", 2, 0, 1)] + idle
+
+        outcome, probes = self.wait_for_outcome(messages)
+
+        self.assertEqual(outcome, (None, None))
+        self.assertEqual(probes, [[("probe", 1), ("probe", 2)]] * 3)
+
+    def test_lost_worker_ends_search(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        hda = HDASTAR(workers=2, budget=SearchBudget(time_limit=None))
+
+        with mock.patch("parallel_astar._hda_worker", crash):
+            result = hda.solve(initial_state)
+
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertEqual(result.reason, "worker")
+        self.assertIsNone(result.moves)
+
+    def test_waiting_for_a_dead_worker_raises(self):
+        hda = HDASTAR(workers=1)
+        process = mock.Mock(exitcode=-9, **{"is_alive.return_value": False})
+
+        with self.assertRaisesRegex(WorkerLost, "worker 0 exited with code -9"):
+            hda._trace((0, 5), [queue.Queue()], queue.Queue(), [process])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from time import time
+from deck import CompressedDeck
+from portfolio import Portfolio
+from searchAlgorithms import ASTAR, BFS, IDASTAR
+from budget import SearchBudget
+from test_searches import SolutionChecks
+
+
+class TestPortfolio(SolutionChecks, unittest.TestCase):
+    def test_first_solution_cancels_the_rest(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        # BFS cannot solve deck11 in its budget; solve() only returns once it has stopped
+        portfolio = Portfolio({"A*": ASTAR(), "BFS": BFS(budget=SearchBudget(time_limit=120))}, max_workers=2)
+
+        start_time = time()
+        best = portfolio.solve(initial_state)
+
+        self.assertLess(time() - start_time, 30)
+        self.assertEqual(best["solver"], "A*")
+        self.assert_solves(initial_state, best["moves"])
+
+    def test_best_mode_keeps_shortest_solution(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        portfolio = Portfolio({"A*": ASTAR(), "A* (w=0.2)": ASTAR(weight=0.2), "IDA*": IDASTAR()}, mode="best")
+
+        best = portfolio.solve(initial_state)
+
+        self.assertEqual(len(portfolio.outcomes), 3)
+        shortest = min(len(outcome["moves"]) for outcome in portfolio.outcomes if outcome["solved"])
+        self.assertEqual(len(best["moves"]), shortest)
+        self.assert_solves(initial_state, best["moves"])
+
+
+if __name__ == "__main__":
+    unittest.main()
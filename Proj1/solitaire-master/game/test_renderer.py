@@ -0,0 +1,82 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import renderer
+from deck import Deck
+
+
+class TestCardAtlas(unittest.TestCase):
+    def test_atlas_is_shared_per_card_size(self):
+        atlas = renderer.card_atlas((100, 150))
+
+        self.assertIs(renderer.card_atlas((100, 150)), atlas)
+        self.assertIsNot(renderer.card_atlas((40, 60)), atlas)
+        self.assertEqual(len(atlas.images), 52)
+        self.assertEqual(atlas.face("queen", "hearts").get_size(), (100, 150))
+
+    def test_decks_draw_from_the_atlas(self):
+        deck = Deck.load_deck_from_file("states/deck9.txt")
+        clone = deck.clone()
+
+        self.assertIs(deck.card_images, clone.card_images)
+        self.assertIs(deck.card_images, renderer.card_atlas(deck.card_size).images)
+        deck.display(pygame.Surface((1100, 800)))
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.game_display = pygame.display.set_mode((1100, 800))
+        self.deck = Deck.load_deck_from_file("states/deck9.txt")
+        self.deck.update(None, 800)
+        self.screen = renderer.DirtyRectRenderer((41, 71, 38))
+
+    def test_unchanged_frame_updates_nothing(self):
+        self.screen.render(self.game_display, self.deck, [], (0, 0))
+
+        self.assertEqual(self.screen.render(self.game_display, self.deck, [], (0, 0)), [])
+
+    def test_move_only_redraws_the_two_piles(self):
+        self.screen.render(self.game_display, self.deck, [], (0, 0))
+        source, target = self.deck.piles[0], self.deck.piles[8]
+        source.transfer_cards(source.cards[-1:], target, self.deck.ranks)
+        self.deck.update([source, target], 800)
+
+        dirty = self.screen.render(self.game_display, self.deck, [], (0, 0))
+
+        self.assertEqual(len(dirty), 2)
+        self.assertTrue(dirty[0].colliderect(renderer.pile_area(self.deck, source)))
+        self.assertTrue(dirty[1].colliderect(renderer.pile_area(self.deck, target)))
+        self.assertFalse(any(rect.colliderect(renderer.pile_area(self.deck, self.deck.piles[3])) for rect in dirty))
+
+    def test_invalidate_redraws_everything(self):
+        self.screen.render(self.game_display, self.deck, [], (0, 0))
+        self.screen.invalidate()
+
+        self.assertEqual(self.screen.render(self.game_display, self.deck, [], (0, 0)),
+                         [self.game_display.get_rect()])
+
+
+class TestMenuSprites(unittest.TestCase):
+    def test_gradient_is_drawn_once(self):
+        background = renderer.vertical_gradient((200, 100), (41, 71, 38))
+
+        self.assertIs(renderer.vertical_gradient((200, 100), (41, 71, 38)), background)
+        self.assertEqual(background.get_at((0, 0))[:3], (41, 71, 38))
+        self.assertLess(sum(background.get_at((0, 99))[:3]), sum(background.get_at((0, 50))[:3]))
+
+    def test_falling_cards_share_sprites_per_bucket(self):
+        face = renderer.card_atlas((40, 60)).face("ace", "hearts")
+        sprite, size = renderer.falling_card_sprite(face, 0.91, 7)
+
+        self.assertIs(renderer.falling_card_sprite(face, 0.93, 6)[0], sprite)
+        self.assertIsNot(renderer.falling_card_sprite(face, 0.55, 7)[0], sprite)
+        self.assertIsNot(renderer.falling_card_sprite(None, 0.91, 7)[0], sprite)
+        self.assertEqual(size, (int(40 * (0.7 + 0.3 * 0.95)), int(60 * (0.7 + 0.3 * 0.95))))
+
+
+if __name__ == "__main__":
+    unittest.main()
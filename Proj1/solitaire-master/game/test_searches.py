@@ -0,0 +1,124 @@
+import unittest
+from deck import CompressedDeck
+from time import time
+from searchAlgorithms import ASTAR, AnytimeASTAR, BFS, Greedy, IDASTAR
+from budget import SearchBudget, BudgetExceeded
+
+
+class SolutionChecks:
+    """
+    Assertions on the move lists solvers return, shared by the solver tests.
+    """
+
+    def assert_valid_moves(self, initial_state, moves):
+        """
+        Checks that each move is valid in turn and returns the state they lead to.
+        """
+        state = initial_state.snapshot()
+        for move in moves:
+            self.assertTrue(state.valid_transfer(*move), move)
+            state.apply_move(move)
+        return state
+
+    def assert_solves(self, initial_state, moves):
+        self.assertTrue(self.assert_valid_moves(initial_state, moves).check_for_win())
+
+
+class TestSearches(SolutionChecks, unittest.TestCase):
+
+    def test_astar_solves_deal(self):
+        initial_state = CompressedDeck.load_from_file("states/deck2.txt")
+        astar = ASTAR()
+
+        node = astar.a_star_search(initial_state, lambda deck: deck.check_for_win(), astar.get_valid_moves,
+                                   astar.heuristic)
+
+        self.assertIsNotNone(node)
+        self.assert_solves(initial_state, astar.node_moves(node))
+
+    def test_greedy_never_reopens_states(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        greedy = Greedy()
+
+        node = greedy.greedy_search(initial_state, lambda deck: deck.check_for_win(), greedy.get_valid_moves,
+                                    greedy.heuristic)
+
+        self.assertIsNotNone(node)
+        self.assert_solves(initial_state, greedy.node_moves(node))
+        keys = [pool_node.key for pool_node in greedy.node_pool.nodes]
+        self.assertEqual(len(keys), len(set(keys)))
+
+    def test_anytime_astar_only_publishes_improvements(self):
+        initial_state = CompressedDeck.load_from_file("states/deck9.txt")
+        anytime = AnytimeASTAR()
+        published = []
+
+        moves = anytime.anytime_search(initial_state, lambda deck: deck.check_for_win(), anytime.get_valid_moves,
+                                       anytime.heuristic, time(), publish=published.append)
+
+        self.assertIsNotNone(moves)
+        self.assertEqual(moves, published[-1])
+        lengths = [len(solution) for solution in published]
+        self.assertEqual(lengths, sorted(set(lengths), reverse=True))
+        self.assertGreater(len(published), 1)
+        self.assert_solves(initial_state, moves)
+
+    def test_idastar_solves_deal(self):
+        initial_state = CompressedDeck.load_from_file("states/deck11.txt")
+        idastar = IDASTAR()
+
+        moves = idastar.ida_star_search(initial_state, lambda deck: deck.check_for_win(), idastar.heuristic)
+
+        self.assertIsNotNone(moves)
+        self.assert_solves(initial_state, moves)
+        self.assertGreater(idastar.nodes_expanded, 0)
+
+    def test_idastar_respects_table_bound(self):
+        initial_state = CompressedDeck.load_from_file("states/deck2.txt")
+        idastar = IDASTAR(table_size=10)
+
+        moves = idastar.ida_star_search(initial_state, lambda deck: deck.check_for_win(), idastar.heuristic)
+
+        self.assertIsNotNone(moves)
+        self.assert_solves(initial_state, moves)
+        self.assertEqual(idastar.peak_table_size, 10)
+
+    def test_idastar_counts_each_search_separately(self):
+        initial_state = CompressedDeck.load_from_file("states/deck2.txt")
+        idastar = IDASTAR()
+
+        idastar.solve(initial_state)
+        first = (idastar.iterations, idastar.nodes_expanded)
+        idastar.solve(initial_state)
+
+        self.assertEqual((idastar.iterations, idastar.nodes_expanded), first)
+
+    def test_node_budget_returns_best_partial_state(self):
+        initial_state = CompressedDeck.load_from_file("states/deck9.txt")
+        astar = ASTAR(budget=SearchBudget(max_nodes=20))
+
+        result = astar.a_star_search(initial_state, lambda deck: deck.check_for_win(), astar.get_valid_moves,
+                                     astar.heuristic)
+
+        self.assertIsInstance(result, BudgetExceeded)
+        self.assertEqual((result.reason, result.nodes), ("nodes", 20))
+        self.assertEqual(self.assert_valid_moves(initial_state, result.moves), result.state)
+
+    def test_time_budget_stops_every_solver(self):
+        initial_state = CompressedDeck.load_from_file("states/deck2.txt")
+        budget = SearchBudget(time_limit=0, check_every=1)
+        goal = lambda deck: deck.check_for_win()
+
+        bfs = BFS(budget=budget)
+        idastar = IDASTAR(budget=budget)
+        results = [bfs.bfs_search(initial_state, goal, bfs.get_valid_moves),
+                   idastar.ida_star_search(initial_state, goal, idastar.heuristic)]
+
+        for result in results:
+            self.assertIsInstance(result, BudgetExceeded)
+            self.assertEqual(result.reason, "time")
+            self.assertIsNotNone(result.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
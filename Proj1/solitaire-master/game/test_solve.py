@@ -0,0 +1,65 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from budget import SearchBudget
+from solve import main, find_deals, solve_deal
+
+
+class TestSolveCommand(unittest.TestCase):
+    def test_finds_deals_in_directory_and_glob(self):
+        self.assertIn(os.path.join("states", "deck2.txt"), find_deals(["states"]))
+        self.assertEqual(find_deals(["states/deck1?.txt"]),
+                         [os.path.join("states", "deck10.txt"), os.path.join("states", "deck11.txt")])
+
+    def test_writes_jsonl_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.jsonl")
+            main(["states/deck2.txt", "states/deck9.txt", "--jobs", "2", "--output", output])
+
+            with open(output) as results:
+                rows = sorted((json.loads(line) for line in results), key=lambda row: row["file"])
+
+        self.assertEqual([row["file"] for row in rows], ["states/deck2.txt", "states/deck9.txt"])
+        for row in rows:
+            self.assertTrue(row["solved"])
+            self.assertGreater(row["moves"], 0)
+            self.assertGreater(row["nodes"], 0)
+            self.assertGreater(row["peak_memory"], 0)
+
+    def test_writes_csv_with_budget_reason(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.csv")
+            main(["states/deck11.txt", "--algorithm", "bfs", "--max-nodes", "50", "--jobs", "1",
+                  "--output", output])
+
+            with open(output, newline="") as results:
+                rows = list(csv.DictReader(results))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["solved"], rows[0]["reason"], rows[0]["nodes"]), ("False", "nodes", "50"))
+
+    def test_traced_memory_is_opt_in(self):
+        plain = solve_deal("states/deck2.txt", "astar", 1, SearchBudget())
+        traced = solve_deal("states/deck2.txt", "astar", 1, SearchBudget(), trace_memory=True)
+
+        self.assertIsNone(plain["traced_memory"])
+        self.assertGreater(traced["traced_memory"], 0)
+        self.assertEqual(traced["nodes"], plain["nodes"])
+
+    def test_solver_modules_do_not_import_pygame(self):
+        code = ("import sys, solve, portfolio, parallel_astar, history_manager; "
+                "from deck import CompressedDeck; "
+                "CompressedDeck.load_from_file('states/deck9.txt').decompress().clone(); "
+                "print('pygame' in sys.modules)")
+
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from budget import SearchBudget
+from deck import Deck
+from searchAlgorithms import ASTAR, BFS
+from solver_task import SolveResult, SolverTask
+
+
+class TestSolverTask(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck.load_deck_from_file("states/deck9.txt")
+
+    def test_solution_arrives_through_the_result(self):
+        task = SolverTask("A*", ASTAR(), self.deck).start()
+        result = task.result(timeout=60)
+
+        self.assertTrue(task.done())
+        self.assertTrue(result.solved)
+        self.assertEqual(result.num_moves, len(result.moves))
+        self.assertEqual(result.path.moves, result.moves)
+        for deck, _ in result.path.replay(self.deck):
+            pass
+        self.assertTrue(deck.check_for_win())
+        progress = task.progress()
+        self.assertGreater(progress["nodes"], 0)
+        self.assertIsNotNone(progress["best_h"])
+
+    def test_cancel_stops_the_search(self):
+        task = SolverTask("BFS", BFS(budget=SearchBudget(time_limit=None, check_every=16)), self.deck)
+        task.cancel()
+        result = task.start().result(timeout=60)
+
+        self.assertFalse(result.solved)
+        self.assertEqual(result.exceeded.reason, "cancelled")
+        self.assertIsNone(task.progress()["best_h"])  # BFS has no heuristic
+
+    def test_result_is_the_score_list(self):
+        result = SolveResult()
+        result[4] = "exceeded"
+
+        self.assertEqual(len(result), 6)
+        self.assertEqual(result.exceeded, "exceeded")
+        self.assertFalse(result.solved)
+
+
+if __name__ == "__main__":
+    unittest.main()
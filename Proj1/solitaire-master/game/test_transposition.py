@@ -0,0 +1,53 @@
+import random
+import tempfile
+import unittest
+from budget import SearchBudget
+from deck import CompressedDeck
+from searchAlgorithms import BFS
+from transposition import DiskTranspositionTable, SpillingTranspositionTable, TranspositionTable
+
+
+class TestDiskTranspositionTable(unittest.TestCase):
+    def test_matches_the_in_memory_table(self):
+        rng = random.Random(7)
+        keys = [rng.getrandbits(64) for _ in range(500)]
+        memory, disk = TranspositionTable(), DiskTranspositionTable(capacity=8)
+
+        for _ in range(3000):
+            key, g = rng.choice(keys), rng.randrange(40)
+            self.assertEqual(disk.record(key, g), memory.record(key, g))
+
+        self.assertEqual(len(disk), len(memory))
+        self.assertGreater(disk.capacity, 8)
+        self.assertEqual(dict(disk.items()), memory.best)
+        self.assertNotIn(rng.getrandbits(64), disk)
+        disk.close()
+
+    def test_spills_past_the_threshold(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table = SpillingTranspositionTable(3, directory)
+            for key in range(3):
+                table.record(key, 1)
+            self.assertFalse(table.spilled)
+
+            table.record(3, 1)
+            self.assertTrue(table.spilled)
+            self.assertFalse(table.record(0, 2))
+            self.assertTrue(table.record(0, 0))
+            self.assertEqual((len(table), table.get(0)), (4, 0))
+            table.close()
+
+
+class TestSpillingSearch(unittest.TestCase):
+    def test_bfs_finds_the_same_solution_on_disk(self):
+        state = CompressedDeck.load_from_file("states/deck2.txt")
+        in_memory = BFS().solve(state)
+        self.assertIsInstance(in_memory, list)
+        with tempfile.TemporaryDirectory() as directory:
+            spilled = BFS(budget=SearchBudget(spill_after=10, spill_dir=directory)).solve(state)
+
+        self.assertEqual(spilled, in_memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
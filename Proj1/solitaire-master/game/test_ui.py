@@ -0,0 +1,42 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from ui import Text, Button
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+
+    def test_surface_is_rendered_once(self):
+        text = Text((1100, 800), (0, 0), "FreeCell", 30, (0, 0, 0))
+
+        first, _ = text.text_objects()
+        second, _ = text.text_objects()
+
+        self.assertIs(first, second)
+
+    def test_changing_text_or_color_renders_again(self):
+        text = Text((1100, 800), (0, 0), "FreeCell", 30, (0, 0, 0))
+        surface, _ = text.text_objects()
+
+        text.color = (0, 0, 0)
+        self.assertIs(text.text_objects()[0], surface)
+        text.color = (255, 0, 0)
+        recolored, _ = text.text_objects()
+        self.assertIsNot(recolored, surface)
+        text.text = "Solitaire"
+        self.assertIsNot(text.text_objects()[0], recolored)
+
+    def test_fonts_are_shared(self):
+        title = Text((1100, 800), (0, 0), "FreeCell", 30, (0, 0, 0))
+        button = Button((1100, 800), "Play", (0, 0), (100, 30), (0, 150, 50), text_size=30)
+
+        self.assertIs(title.font, button.text_object.font)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import mmap
+import tempfile
+
+
+class TranspositionTable:
+    """
+    Best g-cost found so far for each canonical state key (``CompressedDeck.key()``).
+
+    Searches call ``record`` for every generated state and drop the state when
+    it returns False, i.e. when the same position (up to column and free-cell
+    order) was already reached at least as cheaply.
+
+    With ``max_size`` set the table stops taking new keys once full (known
+    keys are still updated), so memory stays bounded at the price of some
+    duplicate work.
+    """
+
+    def __init__(self, max_size=None):
+        self.best = {}
+        self.max_size = max_size
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, key):
+        return key in self.best
+
+    def get(self, key, default=None):
+        return self.best.get(key, default)
+
+    def record(self, key, g):
+        """
+        Stores ``g`` for ``key`` if it improves on the stored cost.
+
+        Returns True if the key was new or ``g`` is cheaper than before.
+        """
+        best = self.best.get(key)
+        if best is not None:
+            if best <= g:
+                return False
+        elif self.max_size is not None and len(self.best) >= self.max_size:
+            return True
+        self.best[key] = g
+        return True
+
+
+class DiskTranspositionTable:
+    """
+    TranspositionTable kept in a memory-mapped file, for closed sets larger
+    than RAM.
+
+    It is an open-addressing hash table with linear probing over fixed-width
+    slots: a 64-bit key array followed by a 32-bit array of g + 1 (0 marks an
+    empty slot). Only the pages being probed have to be resident, so the
+    operating system can page the rest out. The file is an anonymous
+    temporary file in ``directory`` and goes away with the table. The table
+    doubles once it is ``MAX_LOAD`` full.
+    """
+
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity=1 << 16, directory=None):
+        self.directory = directory
+        self.count = 0
+        self.file = self.mapping = self.keys = self.costs = None
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._open(size)
+
+    def _open(self, capacity):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.file = tempfile.TemporaryFile(dir=self.directory)
+        self.file.truncate(capacity * 12)
+        self.mapping = mmap.mmap(self.file.fileno(), capacity * 12)
+        view = memoryview(self.mapping)
+        self.keys = view[:capacity * 8].cast("Q")
+        self.costs = view[capacity * 8:].cast("I")
+
+    def _release(self):
+        self.keys.release()
+        self.costs.release()
+        self.mapping.close()
+        self.file.close()
+
+    def close(self):
+        if self.mapping is not None:
+            self._release()
+            self.file = self.mapping = self.keys = self.costs = None
+
+    def __del__(self):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _slot(self, key):
+        keys, costs, mask = self.keys, self.costs, self.mask
+        index = key & mask
+        while costs[index] and keys[index] != key:
+            index = (index + 1) & mask
+        return index
+
+    def __contains__(self, key):
+        return self.costs[self._slot(key)] != 0
+
+    def get(self, key, default=None):
+        stored = self.costs[self._slot(key)]
+        return stored - 1 if stored else default
+
+    def record(self, key, g):
+        """
+        Same contract as ``TranspositionTable.record``.
+        """
+        index = self._slot(key)
+        stored = self.costs[index]
+        if stored:
+            if stored - 1 <= g:
+                return False
+        else:
+            self.keys[index] = key
+            self.count += 1
+        self.costs[index] = g + 1
+        if self.count > self.MAX_LOAD * self.capacity:
+            self._grow()
+        return True
+
+    def items(self):
+        keys, costs = self.keys, self.costs
+        for index in range(self.capacity):
+            if costs[index]:
+                yield keys[index], costs[index] - 1
+
+    def _grow(self):
+        old_keys, old_costs, old_capacity = self.keys, self.costs, self.capacity
+        old = (old_keys, old_costs, self.mapping, self.file)
+        self._open(old_capacity * 2)
+        keys, costs, mask = self.keys, self.costs, self.mask
+        for old_index in range(old_capacity):
+            stored = old_costs[old_index]
+            if stored:
+                key = old_keys[old_index]
+                index = key & mask
+                while costs[index]:
+                    index = (index + 1) & mask
+                keys[index] = key
+                costs[index] = stored
+        old[0].release()
+        old[1].release()
+        old[2].close()
+        old[3].close()
+
+
+class SpillingTranspositionTable:
+    """
+    A TranspositionTable that moves its keys to a DiskTranspositionTable
+    once it holds more than ``threshold`` of them, and carries on there.
+    """
+
+    def __init__(self, threshold, directory=None):
+        self.threshold = threshold
+        self.directory = directory
+        self.table = TranspositionTable()
+        self.spilled = False
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, key):
+        return key in self.table
+
+    def get(self, key, default=None):
+        return self.table.get(key, default)
+
+    def record(self, key, g):
+        recorded = self.table.record(key, g)
+        if not self.spilled and len(self.table) > self.threshold:
+            self.spill()
+        return recorded
+
+    def spill(self):
+        entries = self.table.best
+        disk = DiskTranspositionTable(int(len(entries) * 2 / DiskTranspositionTable.MAX_LOAD), self.directory)
+        for key, g in entries.items():
+            disk.record(key, g)
+        self.table = disk
+        self.spilled = True
+
+    def close(self):
+        if self.spilled:
+            self.table.close()
+
+
+def closed_set(spill_after=None, directory=None):
+    """
+    The table a search keeps its closed set in: in memory, or spilling to a
+    memory-mapped file in ``directory`` after ``spill_after`` keys.
+    """
+    if spill_after is None:
+        return TranspositionTable()
+    return SpillingTranspositionTable(spill_after, directory)
@@ -4,21 +4,57 @@ from math import sqrt
 
 check_img = pygame.image.load(os.path.join('resources', 'check.png'))
 
+_fonts = {}  # (font file, size) -> pygame.font.Font
+
+
+def get_font(name_of_font, size):
+    """
+    Loads each (font file, size) once and shares it between all texts.
+    """
+    font = _fonts.get((name_of_font, size))
+    if font is None:
+        font = _fonts[(name_of_font, size)] = pygame.font.Font(name_of_font, size)
+    return font
+
 
 class Text:
     def __init__(self, display_dimensions, offsets, text, size, color, font="RobotoSlab-Regular", centered=True):
         self.display_width, self.display_height = display_dimensions
         self.x_offset, self.y_offset = offsets
 
+        self._surface = None
         self.text = text
         self.size = size
         self.color = color
         name_of_font = os.path.join('resources', 'fonts', font + '.ttf')
-        self.font = pygame.font.Font(name_of_font, self.size)
+        self.font = get_font(name_of_font, self.size)
         self.centered = centered
 
+    # The rendered surface is kept until the text or its colour changes
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if getattr(self, '_text', None) != text:
+            self._text = text
+            self._surface = None
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        if getattr(self, '_color', None) != color:
+            self._color = color
+            self._surface = None
+
     def text_objects(self):
-        text_surface = self.font.render(self.text, True, self.color)
+        if self._surface is None:
+            self._surface = self.font.render(self.text, True, self.color)
+        text_surface = self._surface
         text_rect = text_surface.get_rect()
         return text_surface, text_rect
 
@@ -49,8 +85,6 @@ class Button:
         self.disabled_color = (200, 200, 200)
         self.disabled_text_color = (230, 230, 230)
 
-        self.text = text
-
         self.text_color = text_color
         if self.enabled == False:
             text_display_color = self.disabled_color
@@ -64,6 +98,15 @@ class Button:
 
         self.action = action
 
+    # The label lives in the text object, so changing it re-renders the text
+    @property
+    def text(self):
+        return self.text_object.text
+
+    @text.setter
+    def text(self, text):
+        self.text_object.text = text
+
     @property
     def x(self):
         if self.centered:
@@ -200,7 +243,7 @@ class Checkbox:
         self.enabled = enabled
 
         self.size = 20
-        self.checkmark = check_img
+        self.checkmark = pygame.transform.scale(check_img, (self.size, self.size))
 
         self.color = (200, 200, 200)
         self.checked_color = (50, 50, 50)
@@ -235,5 +278,4 @@ class Checkbox:
         pygame.draw.rect(game_display, self.color, [self.x, self.y, self.size, self.size])
 
         if self.checked == True:
-            self.checkmark = pygame.transform.scale(self.checkmark, (self.size, self.size))
             game_display.blit(self.checkmark, [self.x, self.y])